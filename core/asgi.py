@@ -11,6 +11,14 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.prod")
+# The ASGI handler runs the sync code of each request in a new thread-sensitive context, so a connection kept open
+# after a request is never reused and stays open until garbage collected (Django ticket #33497). Close them after
+# each request instead, and pool them with PgBouncer, see DB_PGBOUNCER.
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
+
+from library.scheduler import start_scheduler  # noqa: E402
+
+start_scheduler()
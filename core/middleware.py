@@ -0,0 +1,152 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+
+from . import querystats
+from .routers import get_request_state, start_request
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_KEY = "db:primary-pin:{user_id}"
+
+
+class ReplicaMiddleware:
+    """
+    Let the views with replica_reads = True read from the replicas, see ReplicaRouter.
+    A request that writes pins its librarian to the primary for REPLICA_PIN_SECONDS, so the pages they see next,
+    and cache, aren't read from a replica that hasn't caught up with the write yet.
+    Not used when there are no replicas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = start_request()
+        response = self.get_response(request)
+        if state.wrote:
+            self.pin(request)
+        return response
+
+    async def __acall__(self, request):
+        state = start_request()
+        response = await self.get_response(request)
+        if state.wrote:
+            await sync_to_async(self.pin)(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        state = get_request_state()
+        if getattr(view_class, "replica_reads", False) and state is not None:
+            state.replica_reads = not self.is_pinned(request)
+
+    def is_pinned(self, request):
+        user_id = request.session.get(SESSION_KEY)
+        return user_id is not None and cache.get(PRIMARY_PIN_KEY.format(user_id=user_id)) is not None
+
+    def pin(self, request):
+        user_id = request.session.get(SESSION_KEY)
+        if user_id is not None:
+            cache.set(PRIMARY_PIN_KEY.format(user_id=user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+class QueryStatsMiddleware:
+    """
+    Log the number of queries of each request, their total time and how many of them repeated an earlier statement,
+    with the view that served it, as fields of the JSON log line, e.g. view="library.views.LentBooksListView".
+    A statement run N_PLUS_ONE_THRESHOLD times or more is logged as a warning, as it's most likely a query per row of
+    a list, an N+1. Not used when QUERY_STATS_LOGGING is off, unless SLOW_QUERY_LOG is on, for which it only names
+    the view that ran the slow statements.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_STATS_LOGGING and not settings.SLOW_QUERY_LOG:
+            raise MiddlewareNotUsed
+        connection_created.connect(querystats.install_query_stats, dispatch_uid="query-stats")
+        querystats.install_on_open_connections()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, start = querystats.start_request(), time.perf_counter()
+        return self.finish(request, self.get_response(request), stats, start)
+
+    async def __acall__(self, request):
+        stats, start = querystats.start_request(), time.perf_counter()
+        return self.finish(request, await self.get_response(request), stats, start)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        stats = querystats.get_request_stats()
+        if stats is not None:
+            view = getattr(view_func, "view_class", view_func)
+            stats.view = f"{view.__module__}.{view.__qualname__}"
+
+    def finish(self, request, response, stats, start):
+        if not settings.QUERY_STATS_LOGGING:
+            return response
+        if response.streaming:
+            # The queries of a streamed response, like the CSV exports, run while it's sent.
+            stream = self.alog_when_sent if response.is_async else self.log_when_sent
+            response.streaming_content = stream(response.streaming_content, request, response, stats, start)
+        else:
+            self.log(request, response, stats, start)
+        return response
+
+    def log_when_sent(self, content, request, response, stats, start):
+        try:
+            yield from content
+        finally:
+            self.log(request, response, stats, start)
+
+    async def alog_when_sent(self, content, request, response, stats, start):
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            self.log(request, response, stats, start)
+
+    def log(self, request, response, stats, start):
+        fields = {
+            "view": stats.view,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "db_queries": stats.count,
+            "db_time_ms": round(stats.duration * 1000, 1),
+            "db_duplicates": stats.duplicates,
+        }
+        repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            fields["n_plus_one"] = [{"sql": sql, "count": count} for sql, count in repeated]
+            logger.warning(
+                f"Possible N+1 queries in {stats.view}: a statement ran {repeated[0][1]} times.", extra=fields
+            )
+        else:
+            logger.info(
+                f"{request.method} {request.path} {response.status_code}, {stats.count} queries in "
+                f"{fields['db_time_ms']} ms.",
+                extra=fields,
+            )
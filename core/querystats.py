@@ -0,0 +1,73 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.db import connections
+
+# Stats of the queries of the current request, None outside of requests.
+_request_stats = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """
+    Number, total time and SQL of the queries run on behalf of a request, whichever thread or connection ran them.
+    Statements are told apart by their SQL with the parameters left out, so a query run once per row of a list shows
+    up as one statement with a high count.
+    """
+
+    def __init__(self):
+        self.view = None
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def add(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values())
+
+    def repeated(self, threshold):
+        """
+        The statements run at least threshold times, most repeated first.
+        """
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+def start_request():
+    stats = QueryStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def get_request_stats():
+    return _request_stats.get()
+
+
+def install_query_stats(connection, **kwargs):
+    """
+    Record the queries of the connection in the stats of the current request. Run for every connection as it's
+    opened, and by QueryStatsMiddleware for those opened before it was loaded.
+    """
+    if _record_query not in connection.execute_wrappers:
+        # First, so it also wraps the wrappers added and removed around a block with connection.execute_wrapper().
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+def install_on_open_connections():
+    for connection in connections.all(initialized_only=True):
+        install_query_stats(connection)
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add(sql, time.perf_counter() - start)
@@ -0,0 +1,58 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Routing state of the current request, None outside of requests.
+_request_state = ContextVar("db_routing", default=None)
+
+
+class RequestState:
+    def __init__(self):
+        # Set by ReplicaMiddleware for views with replica_reads, unless the librarian is pinned to the primary.
+        self.replica_reads = False
+        self.wrote = False
+
+
+def start_request():
+    state = RequestState()
+    _request_state.set(state)
+    return state
+
+
+def get_request_state():
+    return _request_state.get()
+
+
+class ReplicaRouter:
+    """
+    Send the reads of the list, search, export and dashboard views to a random replica from DATABASE_REPLICAS, and
+    everything else to the primary, default. The views opt in with replica_reads = True, see ReplicaMiddleware.
+    Writes and select_for_update() always go to the primary, and so do objects read from a replica when saved.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is not None and state.replica_reads and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+            # The rest of the request reads its own writes, which a lagging replica may not have yet.
+            state.replica_reads = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
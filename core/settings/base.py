@@ -0,0 +1,252 @@
+"""
+Django settings for core project, shared by the dev and prod settings modules.
+
+Generated by 'django-admin startproject' using Django 5.0.1.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.0/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.0/ref/settings/
+"""
+import os
+from pathlib import Path
+
+import environ
+
+from core.logging_formatter import CustomJsonFormatter as JsonFormatter
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+env = environ.Env()
+environ.Env.read_env(os.path.join(BASE_DIR, "core", ".env"))
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = env("SECRET_KEY", default='django-insecure-p=@q4-@qda^=-323h4g4yad1vzut-fln3$7bf^&72&((vqf9un')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = env.list("ALLOWED_HOSTS", default=["*"])
+
+
+# Application definition
+
+DJANGO_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "django.contrib.postgres",
+]
+
+THIRD_PARTY_APPS = []
+
+LOCAL_APPS = [
+    "users",
+    "library",
+    "tenants",
+    "slowqueries",
+]
+
+INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.QueryStatsMiddleware",
+    "tenants.middleware.TenantMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ReplicaMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "core.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [os.path.join(BASE_DIR, "templates")],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+                "library.context_processors.greeting",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "core.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',  # Sử dụng MySQL làm cơ sở dữ liệu
+        'NAME': 'quanlysach',  # Tên cơ sở dữ liệu
+        'USER': 'postgres',  # Tên đăng nhập
+        'PASSWORD': 'Quang123',  # Mật khẩu
+        'HOST': env("DB_HOST", default='book-database.cpiziyom2hrl.us-east-1.rds.amazonaws.com'),  # Mặc định là localhost
+        'PORT': env("DB_PORT", default='5432'),
+        # Keep connections open between requests instead of paying a new TLS handshake to RDS on each one. 0 closes
+        # them after every request as before; health checks replace connections the server dropped meanwhile.
+        # Only for core.wsgi: core.asgi defaults it to 0, as the ASGI handler can't reuse them, and relies on
+        # PgBouncer in front of RDS for pooling.
+        'CONN_MAX_AGE': env.int("DB_CONN_MAX_AGE", default=60),
+        'CONN_HEALTH_CHECKS': env.bool("DB_CONN_HEALTH_CHECKS", default=True),
+        # Set when DB_HOST/DB_PORT point at PgBouncer in transaction pooling mode, which can't keep the server-side
+        # cursors of queryset.iterator() open across transactions. The CSV exports then fetch each query whole.
+        # Tenants need session pooling instead: the search path that routes a connection to a tenant's schema is set
+        # once per session, not per transaction.
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool("DB_PGBOUNCER", default=False),
+        'OPTIONS': {
+            'connect_timeout': env.int("DB_CONNECT_TIMEOUT", default=10),
+        },
+    }
+}
+
+# Read replicas of the primary, e.g. RDS read replicas, given by host name and reached with the same credentials.
+# The list, search, export and dashboard views read from them (see core.routers). For a local setup with two
+# aliases, DB_REPLICA_HOSTS=localhost makes a second connection to the same database.
+for index, host in enumerate(env.list("DB_REPLICA_HOSTS", default=[]), start=1):
+    DATABASES[f"replica{index}"] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# How long a librarian's reads stay on the primary after a write, to cover the replication lag. Relies on a cache
+# shared by the workers, see CACHE_URL.
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=10)
+
+# Tenants share the database and its connections, each with its own schema (see tenants.middleware), and reporting
+# reads go to the replicas.
+DATABASE_ROUTERS = ["tenants.routers.TenantRouter", "core.routers.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Per-process local memory by default, which is what the tests and a single dev server use. Production has to set
+# CACHE_URL to a backend shared by all workers (see prod.py), e.g. "filecache:///var/tmp/library-cache" on a single
+# host, or "rediscache://host:6379/1" for Redis or any server speaking its protocol (needs the redis package).
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://library")}
+CACHES["default"]["KEY_FUNCTION"] = "tenants.cache.make_key"
+
+# Sessions are read from the cache and only fall back to the database on a miss.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# Password validation
+# https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.0/topics/i18n/
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "Africa/Nairobi"
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.0/howto/static-files/
+
+STATIC_URL = "/static/"
+
+STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+AUTH_USER_MODEL = "users.Librarian"
+
+# Loads the logged-in Librarian from the cache on each request, see users.backends.
+AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+
+# Seconds a logged-in Librarian stays cached, 0 loads them from the database on every request.
+USER_CACHE_TIMEOUT = env.int("USER_CACHE_TIMEOUT", default=300)
+
+LOGIN_URL = "login"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": JsonFormatter,
+        },
+    },
+    "handlers": {
+        "console": {
+            "level": "DEBUG",
+            "class": "logging.StreamHandler",
+            "formatter": "json",
+        }
+    },
+    "root": {"level": "INFO", "handlers": ["console"]},
+}
+
+# Log the number and total time of the queries of each request, see core.middleware.QueryStatsMiddleware. A statement
+# run this many times in one request is logged as a possible N+1.
+QUERY_STATS_LOGGING = env.bool("QUERY_STATS_LOGGING", default=True)
+N_PLUS_ONE_THRESHOLD = env.int("N_PLUS_ONE_THRESHOLD", default=10)
+
+# Save the statements taking SLOW_QUERY_THRESHOLD_MS or more, with the view and line that ran them, to the Slow queries
+# page of the admin, and the plan of a SLOW_QUERY_EXPLAIN_RATE sample of them, see slowqueries.recorder. The sampled
+# SELECTs run a second time for EXPLAIN ANALYZE, on the database they ran on, so keep the rate low on a busy primary.
+SLOW_QUERY_LOG = env.bool("SLOW_QUERY_LOG", default=False)
+SLOW_QUERY_THRESHOLD_MS = env.int("SLOW_QUERY_THRESHOLD_MS", default=500)
+SLOW_QUERY_EXPLAIN_RATE = env.float("SLOW_QUERY_EXPLAIN_RATE", default=0.1)
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = env.int("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", default=30000)
+
+# Seconds the per-librarian dashboard stats stay cached, 0 disables the cache.
+DASHBOARD_STATS_CACHE_TIMEOUT = env.int("DASHBOARD_STATS_CACHE_TIMEOUT", default=300)
+
+# Rows per page on the list views, overridable per request with ?page_size= up to the maximum.
+LIST_PAGE_SIZE = env.int("LIST_PAGE_SIZE", default=25)
+LIST_MAX_PAGE_SIZE = env.int("LIST_MAX_PAGE_SIZE", default=100)
+
+# Most books or loans a bulk lend or return of the JSON API takes in one request.
+API_MAX_BATCH_SIZE = env.int("API_MAX_BATCH_SIZE", default=100)
+
+# Run the fine accrual job in a background thread of each web process, for deployments that can't run
+# "manage.py accrue_fines" from cron.
+FINE_ACCRUAL_SCHEDULER = env.bool("FINE_ACCRUAL_SCHEDULER", default=False)
+FINE_ACCRUAL_INTERVAL = env.int("FINE_ACCRUAL_INTERVAL", default=3600)
+
+# Seconds a page of the list views stays cached per librarian, 0 disables the cache.
+LIST_CACHE_TIMEOUT = env.int("LIST_CACHE_TIMEOUT", default=300)
@@ -0,0 +1,15 @@
+"""
+Settings for local development and the tests.
+"""
+
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
+
+INSTALLED_APPS += ["django_extensions"]  # noqa: F405
+
+GRAPH_MODELS = {
+    'all_applications': True,
+    'group_models': True,
+    'app_labels': ["library", "users"],
+}
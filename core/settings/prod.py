@@ -0,0 +1,45 @@
+"""
+Settings for production, selected with DJANGO_SETTINGS_MODULE=core.settings.prod.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+
+# Set SECRET_KEY in the environment; there is no default in production.
+SECRET_KEY = env("SECRET_KEY")  # noqa: F405
+
+DEBUG = False
+
+# The workers have to share the cache: the data versions that invalidate the cached pages, the cached Librarians and
+# tenants, and the pins to the primary after a write are all read from it. There's no default, as a local memory cache
+# per process would leave the other workers serving stale pages and logins.
+CACHES = {"default": env.cache("CACHE_URL")}  # noqa: F405
+CACHES["default"]["KEY_FUNCTION"] = "tenants.cache.make_key"
+if CACHES["default"]["BACKEND"].endswith(".LocMemCache") and env.int("WEB_CONCURRENCY", default=0) != 1:  # noqa: F405
+    raise ImproperlyConfigured("CACHE_URL must be shared by the workers, set WEB_CONCURRENCY=1 for a locmem cache.")
+
+# Parse each template once per process instead of on every render. Listing the loaders explicitly means the app
+# directories are searched through them, so APP_DIRS has to be off.
+TEMPLATES[0]["APP_DIRS"] = False  # noqa: F405
+TEMPLATES[0]["OPTIONS"]["loaders"] = [  # noqa: F405
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
+# collectstatic writes hashed, compressed copies of the static files, which whitenoise serves with far-future cache
+# headers.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.storage.StaticFilesStorage"},
+}
+
+# Render terminates TLS in front of the app.
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+SESSION_COOKIE_SECURE = env.bool("SECURE_COOKIES", default=True)  # noqa: F405
+CSRF_COOKIE_SECURE = env.bool("SECURE_COOKIES", default=True)  # noqa: F405
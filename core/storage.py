@@ -0,0 +1,19 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    Compressed, hashed static files that tolerate dangling references in the vendored assets, like the source maps
+    of minified scripts that aren't shipped. Those references are left as they are instead of failing collectstatic.
+    """
+
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def convert(matchobj):
+            try:
+                return converter(matchobj)
+            except ValueError:
+                return matchobj.group(0)
+
+        return convert
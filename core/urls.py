@@ -19,6 +19,7 @@ from django.urls import include, path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/v1/", include("library.api.urls", namespace="v1")),
     path("", include("library.urls")),
     path("", include("users.urls")),
 ]
@@ -11,6 +11,10 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.prod")
 
 application = get_wsgi_application()
+
+from library.scheduler import start_scheduler  # noqa: E402
+
+start_scheduler()
@@ -0,0 +1,77 @@
+"""
+Gunicorn configuration, loaded from the working directory by "gunicorn core.wsgi:application".
+Defaults are sized from the cores of the machine and can be overridden from the environment.
+https://docs.gunicorn.org/en/stable/settings.html
+"""
+
+import multiprocessing
+import os
+import time
+
+# The cores this process may run on, which inside a container can be fewer than the machine has.
+cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Threaded workers serve the WSGI application, which keeps its database connections open between requests (see
+# DB_CONN_MAX_AGE). Serving core.asgi:application with GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker is opt-in:
+# the ASGI handler can't reuse connections, so it closes them after each request and needs PgBouncer in front of the
+# database for pooling, see DB_PGBOUNCER.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+async_workers = "uvicorn" in worker_class.lower()
+
+# An async worker keeps its core busy with many requests at once, so one per core is enough. Sync workers block on
+# each request and follow gunicorn's advice of (2 x cores) + 1.
+workers = int(os.environ.get("WEB_CONCURRENCY", cpu_count + 1 if async_workers else cpu_count * 2 + 1))
+
+# Threads per worker, only used by the sync and gthread worker classes.
+threads = int(os.environ.get("GUNICORN_THREADS", 1 if async_workers else 4))
+
+# Import the application once in the master and fork the workers from it, so they share the imported code
+# copy-on-write and start faster. Database connections are only opened by the workers.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+
+# Restart each worker after a number of requests, jittered so they don't all restart at once, to bound memory growth.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Longer than the 60 second idle timeout common to load balancers, so they don't reuse connections being closed.
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 75))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# The heartbeat file of each worker lives in memory rather than on a disk that may block.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+# Worker lifecycle hooks. Each event is logged with the worker's pid, for log-based metrics on restarts, timeouts
+# and worker uptime.
+
+
+def post_fork(server, worker):
+    worker.started_at = time.monotonic()
+
+
+def post_worker_init(worker):
+    worker.log.info(f"Worker {worker.pid} ready ({worker.__class__.__name__}).")
+
+
+def worker_int(worker):
+    worker.log.info(f"Worker {worker.pid} interrupted.")
+
+
+def worker_abort(worker):
+    worker.log.warning(f"Worker {worker.pid} aborted, a request took longer than {timeout} seconds.")
+
+
+def worker_exit(server, worker):
+    uptime = time.monotonic() - getattr(worker, "started_at", time.monotonic())
+    server.log.info(f"Worker {worker.pid} exited after {uptime:.0f} seconds.")
+
+
+def nworkers_changed(server, new_value, old_value):
+    server.log.info(f"Workers changed from {old_value} to {new_value}.")
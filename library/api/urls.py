@@ -0,0 +1,21 @@
+from django.urls import path
+
+from .views import (
+    BooksApiView,
+    BulkLendApiView,
+    BulkReturnApiView,
+    LoansApiView,
+    MembersApiView,
+    PaymentsApiView,
+)
+
+app_name = "api"
+
+urlpatterns = [
+    path("books/", BooksApiView.as_view(), name="books"),
+    path("members/", MembersApiView.as_view(), name="members"),
+    path("loans/", LoansApiView.as_view(), name="loans"),
+    path("loans/lend/", BulkLendApiView.as_view(), name="bulk-lend"),
+    path("loans/return/", BulkReturnApiView.as_view(), name="bulk-return"),
+    path("payments/", PaymentsApiView.as_view(), name="payments"),
+]
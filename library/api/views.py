@@ -0,0 +1,239 @@
+"""
+Version 1 of the JSON API, for the barcode scanner stations of the checkout desks.
+Clients sign in through the login page and send the session cookie, and for POST requests the csrftoken cookie back
+in the X-CSRFToken header. Only the logged-in Librarian's data is served.
+"""
+
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.generic import View
+
+from ..decorators import api_login_required
+from ..fines import BORROWING_LIMIT, aensure_fines_accrued, ensure_fines_accrued
+from ..forms import BulkLendForm, BulkReturnForm
+from ..inventory import return_loans
+from ..lending import BookUnavailableError, lend_books
+from ..mixins import LibrarianQuerysetMixin
+from ..models import Book, BorrowedBook, Member, Transaction
+from ..pagination import apaginate
+from ..search import search_books, search_borrowed_books, search_members, search_payments
+
+logger = logging.getLogger(__name__)
+
+
+def book_data(book):
+    return {
+        "id": book.pk,
+        "title": book.title,
+        "author": book.author,
+        "category": book.category,
+        "quantity": book.quantity,
+        "borrowing_fee": book.borrowing_fee,
+        "status": book.status,
+        "created_at": book.created_at,
+    }
+
+
+def member_data(member):
+    return {
+        "id": member.pk,
+        "name": member.name,
+        "email": member.email,
+        "amount_due": member.amount_due,
+        "created_at": member.created_at,
+    }
+
+
+def loan_data(loan):
+    return {
+        "id": loan.pk,
+        "book": loan.book_id,
+        "member": loan.member_id,
+        "return_date": loan.return_date,
+        "fine": loan.fine,
+        "returned": loan.returned,
+        "is_overdue": loan.is_overdue,
+        "created_at": loan.created_at,
+    }
+
+
+def payment_data(payment):
+    return {
+        "id": payment.pk,
+        "member": payment.member_id,
+        "amount": payment.amount,
+        "payment_method": payment.payment_method,
+        "created_at": payment.created_at,
+    }
+
+
+def read_json(request):
+    """
+    The JSON object in the request body, or None if there isn't one.
+    """
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def errors_response(form):
+    return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+
+
+class ApiListView(LibrarianQuerysetMixin, View):
+    """
+    Base view returning a keyset page of the logged-in Librarian's data, newest first, like the list pages.
+    ``query`` searches the same way their search box does, ``after``/``before`` are the cursors of the next and
+    previous links, and ``page_size`` sets the number of results.
+    """
+
+    replica_reads = True
+    serialize = None
+
+    async def get(self, request, *args, **kwargs):
+        await aensure_fines_accrued()
+        query = request.GET.get("query")
+        try:
+            queryset = self.get_queryset(request, query)
+        except ValidationError as e:
+            return JsonResponse({"detail": e.messages}, status=400)
+        page = await apaginate(request, queryset, query)
+        # The links keep the filters of the request, not only the search query.
+        page.params = {
+            **{key: value for key, value in request.GET.items() if key not in ("after", "before")},
+            **page.params,
+        }
+        return JsonResponse(
+            {
+                "results": [self.serialize(obj) for obj in page],
+                "next": page.next_url and request.build_absolute_uri(page.next_url),
+                "previous": page.previous_url and request.build_absolute_uri(page.previous_url),
+            }
+        )
+
+
+@method_decorator(api_login_required, name="dispatch")
+class BooksApiView(ApiListView):
+    serialize = staticmethod(book_data)
+    model = Book
+    search = staticmethod(search_books)
+
+
+@method_decorator(api_login_required, name="dispatch")
+class MembersApiView(ApiListView):
+    serialize = staticmethod(member_data)
+    model = Member
+    search = staticmethod(search_members)
+
+
+@method_decorator(api_login_required, name="dispatch")
+class LoansApiView(ApiListView):
+    """
+    Loans, narrowed down by ``member``, ``book``, ``returned`` or ``overdue`` as well, e.g. the unreturned loans of
+    the member whose card was scanned.
+    """
+
+    serialize = staticmethod(loan_data)
+    model = BorrowedBook
+    search = staticmethod(search_borrowed_books)
+
+    def get_queryset(self, request, query=None):
+        loans = super().get_queryset(request, query)
+        for field in ("member", "book"):
+            if request.GET.get(field):
+                loans = loans.filter(**{field: BorrowedBook._meta.get_field(field).to_python(request.GET[field])})
+        for field, param in (("returned", "returned"), ("is_overdue", "overdue")):
+            if request.GET.get(param) in ("true", "false"):
+                loans = loans.filter(**{field: request.GET[param] == "true"})
+        return loans
+
+
+@method_decorator(api_login_required, name="dispatch")
+class PaymentsApiView(ApiListView):
+    serialize = staticmethod(payment_data)
+    model = Transaction
+    search = staticmethod(search_payments)
+
+
+@method_decorator(api_login_required, name="dispatch")
+class BulkLendApiView(View):
+    """
+    Lend a basket of books to a member in one transaction, see lend_books().
+    post(): {"member", "books": [ids], "return_date", "fine", "payment_method"}. Answers 201 with the loans and the
+            payment of the borrowing fees, or 400 with the errors if nothing was lent.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        data = read_json(request)
+        if data is None:
+            return JsonResponse({"detail": "The request body must be a JSON object."}, status=400)
+        return await sync_to_async(self.lend)(request, data)
+
+    def lend(self, request, data):
+        # The borrowing limit check reads the member's amount_due, which needs today's fines.
+        ensure_fines_accrued()
+        form = BulkLendForm(data, user=request.user)
+        if not form.is_valid():
+            return errors_response(form)
+
+        member = form.cleaned_data["member"]
+        if member.amount_due > BORROWING_LIMIT:
+            form.add_error(None, "Member has exceeded the borrowing limit.")
+            return errors_response(form)
+
+        try:
+            loans, payment = lend_books(
+                librarian=request.user,
+                member=member,
+                book_ids=[book.pk for book in form.cleaned_data["books"]],
+                return_date=form.cleaned_data["return_date"],
+                fine=form.cleaned_data["fine"],
+                payment_method=form.cleaned_data["payment_method"],
+            )
+        except BookUnavailableError as e:
+            form.add_error(None, str(e))
+            return errors_response(form)
+
+        logger.info(f"{len(loans)} book(s) lent through the API, payment of {payment.amount} made.")
+        return JsonResponse(
+            {"loans": [loan_data(loan) for loan in loans], "payment": payment_data(payment)}, status=201
+        )
+
+
+@method_decorator(api_login_required, name="dispatch")
+class BulkReturnApiView(View):
+    """
+    Return several loans in one transaction, see return_loans().
+    post(): {"loans": [ids], "payment_method"}, the payment method being needed for the fines of overdue loans.
+            Answers 200 with the returned loans and the ids of those that had already been returned.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        data = read_json(request)
+        if data is None:
+            return JsonResponse({"detail": "The request body must be a JSON object."}, status=400)
+        return await sync_to_async(self.return_loans)(request, data)
+
+    def return_loans(self, request, data):
+        form = BulkReturnForm(data, user=request.user)
+        if not form.is_valid():
+            return errors_response(form)
+
+        loan_ids = [loan.pk for loan in form.cleaned_data["loans"]]
+        returned = return_loans(request.user, loan_ids, form.cleaned_data["payment_method"] or None)
+        returned_ids = {loan.pk for loan in returned}
+
+        logger.info(f"{len(returned)} loan(s) returned through the API.")
+        return JsonResponse(
+            {
+                "returned": [loan_data(loan) for loan in returned],
+                "skipped": [pk for pk in loan_ids if pk not in returned_ids],
+            }
+        )
@@ -0,0 +1,62 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = "library:version:{name}"
+
+
+def get_versions(*names):
+    """
+    Return the current version of each named set of data as one string, for use in cache keys.
+    Bumping any of the versions moves readers to new keys, so stale entries are never served and simply expire.
+    """
+    keys = [VERSION_KEY.format(name=name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start from the clock rather than from 0, so a version evicted from the cache can't come back as a value
+            # it already had and revive old entries.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+def bump_version(name):
+    key = VERSION_KEY.format(name=name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def params_digest(params):
+    """
+    Short stable digest of request parameters, to tell apart cached pages of the same list.
+    """
+    return hashlib.sha1(urlencode(sorted(params.items())).encode()).hexdigest()
+
+
+def get_librarian_version(librarian_id):
+    """
+    Version of everything shown to a librarian: their books, members, loans and payments.
+    """
+    return get_versions("library", f"library:{librarian_id}")
+
+
+async def aget_librarian_version(librarian_id):
+    return await sync_to_async(get_librarian_version)(librarian_id)
+
+
+def bump_librarian_version(librarian_id=None):
+    """
+    Invalidate everything cached for a librarian, or for every librarian when librarian_id is None.
+    The version is bumped right away and again once the current transaction commits, so pages cached by concurrent
+    requests that still read the data from before the commit are discarded as well.
+    """
+    name = "library" if librarian_id is None else f"library:{librarian_id}"
+    bump_version(name)
+    transaction.on_commit(lambda: bump_version(name))
@@ -0,0 +1,16 @@
+import uuid
+
+
+class PrimaryKeyConverter:
+    """
+    Matches a UUID primary key, also in the old "<model>-<uuid>" form so links and bookmarks from before the switch
+    to native UUID keys keep resolving.
+    """
+
+    regex = r"(?:[a-z]+-)?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+
+    def to_python(self, value):
+        return uuid.UUID(value[-36:])
+
+    def to_url(self, value):
+        return str(value)
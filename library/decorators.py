@@ -0,0 +1,36 @@
+from functools import wraps
+
+from django.contrib.auth.views import redirect_to_login
+from django.http import JsonResponse
+
+
+def alogin_required(view_func):
+    """
+    login_required for async views, which Django only supports from 5.1 on.
+    The user is loaded with request.auser() and kept as request.user, so neither the view nor its template load it
+    again synchronously.
+    """
+
+    @wraps(view_func)
+    async def _wrapper_view(request, *args, **kwargs):
+        request.user = await request.auser()
+        if request.user.is_authenticated:
+            return await view_func(request, *args, **kwargs)
+        return redirect_to_login(request.get_full_path())
+
+    return _wrapper_view
+
+
+def api_login_required(view_func):
+    """
+    alogin_required for the async views of the JSON API, which answer 401 instead of redirecting to the login page.
+    """
+
+    @wraps(view_func)
+    async def _wrapper_view(request, *args, **kwargs):
+        request.user = await request.auser()
+        if request.user.is_authenticated:
+            return await view_func(request, *args, **kwargs)
+        return JsonResponse({"detail": "Authentication required."}, status=401)
+
+    return _wrapper_view
@@ -0,0 +1,52 @@
+import csv
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    File-like object whose write() hands back what it is given, so csv.writer renders one row at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, fields, rows):
+    writer = csv.writer(Echo())
+    # The byte order mark tells Excel the file is UTF-8, otherwise Vietnamese names come out garbled.
+    yield "\ufeff" + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+async def astream_csv(header, fields, rows):
+    writer = csv.writer(Echo())
+    yield "\ufeff" + writer.writerow(header)
+    async for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+def csv_response(request, filename, columns, queryset):
+    """
+    Stream the queryset as a CSV attachment. columns is a sequence of (header, field lookup) pairs.
+    Rows are fetched in chunks through a server-side cursor and written out as they arrive, so the first
+    bytes are sent right away and memory use stays the same however many rows are exported.
+    Over ASGI the rows are read with the async ORM, so the worker serves other requests while the export waits on the
+    database. The WSGI handler would buffer an async stream whole, so over WSGI they're read with the sync ORM.
+    """
+    headers, fields = zip(*columns)
+    if isinstance(request, ASGIRequest):
+        # Django 5.0 runs the query of values_list().aiterator() in the event loop, which it then refuses; values()
+        # is iterated in a thread as it should be.
+        rows = queryset.values(*fields).aiterator(chunk_size=EXPORT_CHUNK_SIZE)
+        content = astream_csv(headers, fields, rows)
+    else:
+        rows = queryset.values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        content = stream_csv(headers, fields, rows)
+    response = StreamingHttpResponse(content, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,163 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from tenants.schema import get_current_schema
+
+from .cache import bump_librarian_version
+from .models import BorrowedBook, Member, Watermark
+
+logger = logging.getLogger(__name__)
+
+FINES_WATERMARK = "fines"
+
+# Members owing more than this can't borrow books.
+BORROWING_LIMIT = 500
+
+# Flags the loans that passed their return date as overdue and adds their fines to the members' amount_due, all in
+# one statement. The loan rows are locked while flagged, so a concurrent return either happens first and the loan is
+# skipped, or happens after and sees the flag and takes the fine back off.
+ACCRUE_FINES_SQL = """
+    WITH accrued AS (
+        UPDATE {loan_table}
+        SET is_overdue = TRUE, updated_at = %(now)s
+        WHERE returned = FALSE AND is_overdue = FALSE AND return_date < %(today)s {loan_filter}
+        RETURNING member_id, fine
+    ), totals AS (
+        SELECT member_id, SUM(fine) AS total FROM accrued GROUP BY member_id
+    )
+    UPDATE {member_table} AS member
+    SET amount_due = member.amount_due + totals.total, updated_at = %(now)s
+    FROM totals
+    WHERE member.id = totals.member_id
+"""
+
+
+def accrue_fines(today=None, full=False):
+    """
+    Flag the loans that passed their return date as overdue and add their fines to the members' amount_due.
+    This is the daily rollover of BorrowedBook.is_overdue; loans created, edited and returned keep the flag and the
+    balances up to date themselves.
+    Runs are incremental: only loans that passed their return date since the last run are looked at, and a rerun on
+    the same day does nothing. The first run, or a run with full=True, recomputes every flag and balance instead.
+    Returns the number of members whose balance was updated, or None if fines were already accrued for today.
+    """
+    today = today or timezone.now().date()
+
+    with transaction.atomic():
+        # The lock keeps concurrent runs, e.g. from the scheduler of several workers, from accruing twice.
+        watermark, _ = Watermark.objects.select_for_update().get_or_create(name=FINES_WATERMARK)
+        if watermark.value is None or full:
+            updated = _recompute_fines(today)
+        elif watermark.value >= today:
+            return None
+        else:
+            updated = _accrue_new_fines(today, loan_filter="")
+
+        watermark.value = today
+        watermark.save()
+
+    if updated:
+        bump_librarian_version()
+
+    logger.info(f"Accrued fines through {today}, {updated} member balances updated.")
+    return updated
+
+
+def _accrue_new_fines(today, loan_filter, params=None):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            ACCRUE_FINES_SQL.format(
+                loan_table=connection.ops.quote_name(BorrowedBook._meta.db_table),
+                member_table=connection.ops.quote_name(Member._meta.db_table),
+                loan_filter=loan_filter,
+            ),
+            {"now": timezone.now(), "today": today, **(params or {})},
+        )
+        return cursor.rowcount
+
+
+def is_past_due(return_date):
+    # Loans created in code may still hold the return date as a string.
+    return BorrowedBook._meta.get_field("return_date").to_python(return_date) < timezone.now().date()
+
+
+def accrue_loans(loan_ids):
+    """
+    Flag the given loans as overdue right away, for loans created already past their return date.
+    """
+    _accrue_new_fines(timezone.now().date(), loan_filter="AND id = ANY(%(loan_ids)s)", params={"loan_ids": loan_ids})
+
+
+# Last day this process saw the fines accrued for, by schema.
+_accrued_through = {}
+
+
+def ensure_fines_accrued():
+    """
+    Run accrue_fines() if this process hasn't seen it run for today yet in the current schema, so overdue flags are
+    current even when the job isn't scheduled. Costs nothing once the process has checked for the day.
+    """
+    today = timezone.now().date()
+    schema_name = get_current_schema()
+    if _accrued_through.get(schema_name) != today:
+        accrue_fines(today)
+        _accrued_through[schema_name] = today
+
+
+async def aensure_fines_accrued():
+    """
+    Async version of ensure_fines_accrued(), which only leaves the event loop when the fines need accruing.
+    """
+    if _accrued_through.get(get_current_schema()) != timezone.now().date():
+        await sync_to_async(ensure_fines_accrued)()
+
+
+def _recompute_fines(today):
+    now = timezone.now()
+    overdue = Q(returned=False, return_date__lt=today)
+    BorrowedBook.objects.filter(overdue, is_overdue=False).update(is_overdue=True, updated_at=now)
+    BorrowedBook.objects.filter(~overdue, is_overdue=True).update(is_overdue=False, updated_at=now)
+
+    accrued_fines = (
+        BorrowedBook.objects.filter(member=OuterRef("pk"), is_overdue=True)
+        .order_by()
+        .values("member")
+        .annotate(total=Sum("fine"))
+        .values("total")
+    )
+    amount_field = DecimalField(max_digits=10, decimal_places=2)
+    return Member.objects.update(
+        amount_due=Coalesce(Subquery(accrued_fines, output_field=amount_field), Value(0), output_field=amount_field),
+        updated_at=now,
+    )
+
+
+def adjust_amount_due(member_id, delta):
+    if delta:
+        Member.objects.filter(pk=member_id).update(amount_due=F("amount_due") + delta, updated_at=timezone.now())
+
+
+def owed_fine(borrowed_book):
+    """
+    The part of the member's amount_due that comes from this loan.
+    """
+    return borrowed_book.fine if borrowed_book.is_overdue else 0
+
+
+def update_loan(borrowed_book):
+    """
+    Save changes to a loan's return date or fine and keep the member's amount_due in line with them.
+    A loan moved past today accrues its fine right away, one moved back into the future has its fine taken off.
+    """
+    with transaction.atomic():
+        current = BorrowedBook.objects.select_for_update().get(pk=borrowed_book.pk)
+        borrowed_book.returned = current.returned
+        borrowed_book.is_overdue = not current.returned and is_past_due(borrowed_book.return_date)
+        borrowed_book.save()
+        adjust_amount_due(borrowed_book.member_id, owed_fine(borrowed_book) - owed_fine(current))
+
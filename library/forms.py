@@ -1,7 +1,10 @@
 from django import forms
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.validators import FileExtensionValidator
 from django.utils.translation import gettext_lazy as _
 
+from .fines import is_past_due
 from .models import CATEGORY_CHOICES, PAYMENT_METHOD_CHOICES, Book, BorrowedBook, Member
 
 
@@ -31,6 +34,16 @@ class AddMemberForm(forms.ModelForm):
         return email
 
 
+class ImportMemberForm(AddMemberForm):
+    """
+    AddMemberForm for imported rows. Duplicate emails are checked for a whole chunk of rows at once by the importer
+    rather than with a query per row.
+    """
+
+    def clean_email(self):
+        return self.cleaned_data.get("email")
+
+
 class UpdateMemberForm(forms.ModelForm):
     name = forms.CharField(
         widget=forms.TextInput(attrs={"class": "form-control form-control-lg", "placeholder": "Nhập tên thành viên"})
@@ -89,13 +102,11 @@ class AddBookForm(forms.ModelForm):
 
 
 class LendBookForm(forms.ModelForm):
-    book = forms.ModelChoiceField(
+    # Every selected book is looked up, one loan is made per book, see lend_books().
+    book = forms.ModelMultipleChoiceField(
         label="Book / Books",
         queryset=Book.objects.none(),  # Khởi tạo rỗng, sau này lọc dựa trên user
-        empty_label=None,
-        widget=forms.Select(
-            attrs={"class": "form-control form-control-lg js-example-basic-multiple w-100", "multiple": "multiple"}
-        ),
+        widget=forms.SelectMultiple(attrs={"class": "form-control form-control-lg js-example-basic-multiple w-100"}),
     )
 
     member = forms.ModelChoiceField(
@@ -114,7 +125,7 @@ class LendBookForm(forms.ModelForm):
 
     class Meta:
         model = BorrowedBook
-        fields = ["book", "member", "return_date", "fine"]
+        fields = ["member", "return_date", "fine"]
         labels = {
             "book": "Sách",
             "member": "Thành viên",
@@ -167,7 +178,7 @@ class LendMemberBookForm(forms.ModelForm):
 
     class Meta:
         model = BorrowedBook
-        fields = ["book", "member", "return_date", "fine"]
+        fields = ["member", "return_date", "fine"]
         labels = {
             "book": "Sách",
             "member": "Thành viên",
@@ -204,3 +215,69 @@ class PaymentForm(forms.Form):
         label = {
             "payment_method": "Hình thức trả tiền"
         }
+
+
+class ImportCatalogForm(forms.Form):
+    kind = forms.ChoiceField(
+        label="Dữ liệu",
+        choices=(("books", "Sách"), ("members", "Thành viên")),
+        widget=forms.Select(attrs={"class": "form-control form-control-lg"}),
+    )
+    file = forms.FileField(
+        label="Tệp CSV / XLSX",
+        validators=[FileExtensionValidator(["csv", "xlsx"])],
+        widget=forms.ClearableFileInput(attrs={"class": "form-control form-control-lg", "accept": ".csv,.xlsx"}),
+    )
+
+
+class BatchChoiceField(forms.ModelMultipleChoiceField):
+    """
+    ModelMultipleChoiceField for the batches of the JSON API, which turns away batches over API_MAX_BATCH_SIZE
+    before looking them up.
+    """
+
+    def clean(self, value):
+        if isinstance(value, (list, tuple)) and len(value) > settings.API_MAX_BATCH_SIZE:
+            raise ValidationError(
+                f"At most {settings.API_MAX_BATCH_SIZE} items can be sent at once.", code="batch_too_large"
+            )
+        return super().clean(value)
+
+
+class BulkLendForm(forms.Form):
+    """
+    A basket of books lent to one member through the JSON API, one copy of each book.
+    """
+
+    member = forms.ModelChoiceField(queryset=Member.objects.none())
+    books = BatchChoiceField(queryset=Book.objects.none())
+    return_date = forms.DateField()
+    fine = forms.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    payment_method = forms.ChoiceField(choices=PAYMENT_METHOD_CHOICES)
+
+    def __init__(self, *args, user, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["member"].queryset = Member.objects.filter(librarian=user)
+        self.fields["books"].queryset = Book.objects.filter(librarian=user)
+
+
+class BulkReturnForm(forms.Form):
+    """
+    Loans returned together through the JSON API. The fines of loans past their return date are paid on return, so
+    a payment method is needed when there are any.
+    """
+
+    loans = BatchChoiceField(queryset=BorrowedBook.objects.none())
+    payment_method = forms.ChoiceField(choices=PAYMENT_METHOD_CHOICES, required=False)
+
+    def __init__(self, *args, user, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["loans"].queryset = BorrowedBook.objects.filter(librarian=user)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        loans = cleaned_data.get("loans") or []
+        fined = [loan for loan in loans if not loan.returned and loan.fine and is_past_due(loan.return_date)]
+        if fined and not cleaned_data.get("payment_method"):
+            self.add_error("payment_method", "Overdue loans can only be returned with their fine paid.")
+        return cleaned_data
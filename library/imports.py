@@ -0,0 +1,148 @@
+import csv
+import io
+from itertools import islice
+
+import openpyxl
+
+from .cache import bump_librarian_version
+from .forms import AddBookForm, ImportMemberForm
+from .models import Book, Member
+
+IMPORT_CHUNK_SIZE = 1000
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # (row number, message)
+
+    def add_error(self, row_number, message):
+        self.errors.append((row_number, message))
+
+    def add_form_errors(self, row_number, form):
+        for field, messages in form.errors.items():
+            for message in messages:
+                self.add_error(row_number, f"{field}: {message}")
+
+
+def read_rows(file, filename):
+    """
+    Read a CSV or XLSX file one row at a time, yielding (row number, row) pairs where the row is a dict keyed by the
+    lower-cased headers of the first row. Neither format is loaded into memory as a whole.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return _read_csv(file)
+    if extension == "xlsx":
+        return _read_xlsx(file)
+    raise ImportFormatError("Chỉ hỗ trợ tệp CSV hoặc XLSX.")
+
+
+def _read_csv(file):
+    # utf-8-sig drops the byte order mark Excel puts in front of CSV exports.
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    try:
+        headers = [header.strip().lower() for header in next(reader, [])]
+        for row in reader:
+            if any(row):
+                yield reader.line_num, dict(zip(headers, row))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"Không đọc được tệp CSV: {e}") from e
+
+
+def _read_xlsx(file):
+    try:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:  # openpyxl raises a variety of zipfile and XML errors for broken files
+        raise ImportFormatError(f"Không đọc được tệp Excel: {e}") from e
+
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [str(header or "").strip().lower() for header in next(rows, ())]
+        for row_number, row in enumerate(rows, start=2):
+            if any(value is not None for value in row):
+                yield row_number, {
+                    header: "" if value is None else str(value) for header, value in zip(headers, row)
+                }
+    finally:
+        workbook.close()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _clean_rows(form_class, model, rows, result):
+    """
+    Validate rows with form_class and yield (row number, unsaved instance) for the valid ones.
+    A single form is rebound to each row in turn: building a form deep-copies all of its fields and widgets, which
+    costs several times as much as validating the row.
+    """
+    form = form_class(data={})
+    for row_number, row in rows:
+        form.data = row
+        form.instance = model()
+        form.full_clean()
+        if form.errors:
+            result.add_form_errors(row_number, form)
+        else:
+            yield row_number, form.save(commit=False)
+
+
+def _build_books(librarian, rows, result):
+    books = []
+    for _, book in _clean_rows(AddBookForm, Book, rows, result):
+        book.librarian = librarian
+        book.status = "not-available" if book.quantity == 0 else "available"
+        books.append(book)
+    return books
+
+
+def _build_members(librarian, rows, result):
+    valid = list(_clean_rows(ImportMemberForm, Member, rows, result))
+
+    # One query per chunk instead of one per row. Members from earlier chunks are already in the table, so this also
+    # catches duplicates across the whole file.
+    emails = {member.email for _, member in valid}
+    taken = set(Member.objects.filter(email__in=emails).values_list("email", flat=True))
+
+    members = []
+    for row_number, member in valid:
+        if member.email in taken:
+            result.add_error(row_number, "email: Thành viên với email đó đã có")
+            continue
+        taken.add(member.email)
+        member.librarian = librarian
+        members.append(member)
+    return members
+
+
+IMPORTERS = {
+    "books": (Book, _build_books),
+    "members": (Member, _build_members),
+}
+
+
+def import_catalog(librarian, kind, rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validate rows with the same rules as the add book/member forms and insert the valid ones for the librarian.
+    Rows are processed chunk_size at a time with a single INSERT per chunk, so memory use doesn't grow with the file.
+    Invalid rows are skipped and reported in the result's errors.
+    """
+    model, build = IMPORTERS[kind]
+    result = ImportResult()
+
+    for chunk in _chunks(rows, chunk_size):
+        objs = build(librarian, chunk, result)
+        model.objects.bulk_create(objs)
+        result.created += len(objs)
+
+    # bulk_create() doesn't send the signals that normally invalidate the cached pages.
+    bump_librarian_version(librarian.pk)
+    return result
@@ -0,0 +1,142 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+
+from .cache import bump_librarian_version
+from .fines import adjust_amount_due, is_past_due, owed_fine
+from .models import Book, BorrowedBook, Member, Transaction
+
+ADJUST_STOCK_SQL = """
+    UPDATE {table}
+    SET quantity = quantity + %(delta)s,
+        status = CASE WHEN quantity + %(delta)s > 0 THEN 'available' ELSE 'not-available' END,
+        updated_at = %(now)s
+    WHERE id = %(pk)s AND quantity + %(delta)s >= 0
+    RETURNING quantity
+"""
+
+
+def adjust_stock(book_id, delta):
+    """
+    Add delta to a book's quantity and set its status to match, as a single conditional UPDATE.
+    Concurrent adjustments from several workers can't overwrite each other and the stock never goes negative.
+    Returns the new quantity, or None if the book doesn't exist or doesn't have enough copies.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            ADJUST_STOCK_SQL.format(table=connection.ops.quote_name(Book._meta.db_table)),
+            {"delta": delta, "now": timezone.now(), "pk": book_id},
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def restock(book_id):
+    return adjust_stock(book_id, 1)
+
+
+def checkout(book_id):
+    return adjust_stock(book_id, -1)
+
+
+def checkout_many(book_ids):
+    """
+    Take one copy of each book out of stock in a single UPDATE.
+    Returns the number of books updated, which is less than len(book_ids) if some were out of stock.
+    """
+    return Book.objects.filter(pk__in=book_ids, quantity__gt=0).update(
+        quantity=F("quantity") - 1,
+        # The CASE sees the quantity from before the decrement.
+        status=Case(When(quantity__gt=1, then=Value("available")), default=Value("not-available")),
+        updated_at=timezone.now(),
+    )
+
+
+def return_loan(borrowed_book):
+    """
+    Mark a loan as returned, put its book back in stock and take its accrued fine off the member's amount_due.
+    Only the first of several concurrent returns of the same loan restocks the book.
+    Returns the book's new quantity, or None if the loan was already returned.
+    """
+    with transaction.atomic():
+        current = BorrowedBook.objects.select_for_update().filter(pk=borrowed_book.pk, returned=False).first()
+        if current is None:
+            return None
+        BorrowedBook.objects.filter(pk=current.pk).update(returned=True, is_overdue=False, updated_at=timezone.now())
+        adjust_amount_due(current.member_id, -owed_fine(current))
+        quantity = restock(current.book_id)
+
+    borrowed_book.returned = True
+    bump_librarian_version(borrowed_book.librarian_id)
+    return quantity
+
+
+def return_loans(librarian, loan_ids, payment_method=None):
+    """
+    Return several of a librarian's loans at once, with the same few queries however many there are: the loans are
+    marked returned, their books restocked and their accrued fines taken off the members' amount_due in one UPDATE
+    each. With a payment_method, the fines of the loans past their return date are recorded as one payment per
+    member, as ReturnBookFineView does for a single loan.
+    Loans already returned, also by a concurrent request, are skipped. Returns the loans that were returned.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        loans = list(
+            BorrowedBook.objects.select_for_update().filter(pk__in=loan_ids, librarian=librarian, returned=False)
+        )
+        if not loans:
+            return []
+        BorrowedBook.objects.filter(pk__in=[loan.pk for loan in loans]).update(
+            returned=True, is_overdue=False, updated_at=now
+        )
+
+        copies = Counter(loan.book_id for loan in loans)
+        Book.objects.filter(pk__in=copies).update(
+            quantity=F("quantity") + Case(*(When(pk=pk, then=Value(count)) for pk, count in copies.items())),
+            status="available",
+            updated_at=now,
+        )
+
+        owed, paid = Counter(), Counter()
+        for loan in loans:
+            owed[loan.member_id] += owed_fine(loan)
+            if payment_method and is_past_due(loan.return_date):
+                paid[loan.member_id] += loan.fine
+        amount_field = DecimalField(max_digits=10, decimal_places=2)
+        owed = {pk: amount for pk, amount in owed.items() if amount}
+        if owed:
+            Member.objects.filter(pk__in=owed).update(
+                amount_due=F("amount_due")
+                - Case(*(When(pk=pk, then=Value(amount)) for pk, amount in owed.items()), output_field=amount_field),
+                updated_at=now,
+            )
+        Transaction.objects.bulk_create(
+            Transaction(member_id=pk, librarian=librarian, amount=amount, payment_method=payment_method)
+            for pk, amount in paid.items()
+            if amount
+        )
+
+    for loan in loans:
+        loan.returned, loan.is_overdue = True, False
+    # update() and bulk_create() don't send the signals that invalidate the cached pages.
+    bump_librarian_version(librarian.pk)
+    return loans
+
+
+def delete_loan(borrowed_book):
+    """
+    Delete a loan and put its book back in stock if it hadn't been returned.
+    The loan is locked first so it is restocked from its current state, not the possibly stale one passed in.
+    Returns the book's new quantity, or None if nothing was restocked.
+    """
+    with transaction.atomic():
+        current = BorrowedBook.objects.select_for_update().filter(pk=borrowed_book.pk).first()
+        if current is None:
+            return None
+        # The post_delete signal takes the loan's fine off the member's amount_due.
+        current.delete()
+        if current.returned:
+            return None
+        return restock(current.book_id)
@@ -0,0 +1,56 @@
+from django.db import transaction
+
+from .cache import bump_librarian_version
+from .fines import accrue_loans, is_past_due
+from .inventory import checkout_many
+from .models import Book, BorrowedBook, Transaction
+
+
+class BookUnavailableError(ValueError):
+    pass
+
+
+def lend_books(librarian, member, book_ids, return_date, fine, payment_method):
+    """
+    Lend several books to a member and record the borrowing fee payment as one atomic unit.
+    Stock is taken with a conditional UPDATE and the whole lend is rolled back if any book ran out in the meantime,
+    so concurrent lends cannot oversell a book.
+    The number of queries does not depend on how many books are lent.
+    Raises BookUnavailableError if a book does not belong to the librarian or is out of stock.
+    """
+    if member.librarian_id != librarian.pk:
+        raise ValueError("A member can only borrow books from their assigned librarian.")
+    book_ids = set(book_ids)
+
+    with transaction.atomic():
+        books = Book.objects.filter(librarian=librarian, quantity__gt=0).in_bulk(book_ids)
+        if len(books) != len(book_ids) or checkout_many(list(books)) != len(books):
+            raise BookUnavailableError("One or more of the selected books are not available.")
+
+        loans = BorrowedBook.objects.bulk_create(
+            [
+                BorrowedBook(
+                    member=member,
+                    book=book,
+                    librarian=librarian,
+                    return_date=return_date,
+                    fine=fine,
+                )
+                for book in books.values()
+            ]
+        )
+
+        payment = Transaction.objects.create(
+            member=member,
+            librarian=librarian,
+            amount=sum(book.borrowing_fee for book in books.values()),
+            payment_method=payment_method,
+        )
+
+        if is_past_due(return_date):
+            accrue_loans([loan.pk for loan in loans])
+
+    # bulk_create() and update() don't send the signals that normally invalidate the cached pages. Invalidating after
+    # the commit also keeps a concurrent dashboard request from caching the figures from before the lend.
+    bump_librarian_version(librarian.pk)
+    return loans, payment
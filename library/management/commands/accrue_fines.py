@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from library.fines import accrue_fines
+from tenants.routing import get_schemas
+from tenants.schema import tenant_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Add the fines of loans that became overdue since the last run to the members' amount_due, in the public "
+        "schema and the schema of every tenant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true", help="Recompute every member's amount_due instead of only the new fines."
+        )
+
+    def handle(self, *args, **options):
+        for schema_name in get_schemas():
+            prefix = f"{schema_name}: " if schema_name else ""
+            with tenant_schema(schema_name):
+                updated = accrue_fines(full=options["full"])
+            if updated is None:
+                self.stdout.write(f"{prefix}Fines are already accrued for today.")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{prefix}Updated the amount due of {updated} members."))
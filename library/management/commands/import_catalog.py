@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from library.imports import IMPORT_CHUNK_SIZE, IMPORTERS, ImportFormatError, import_catalog, read_rows
+from tenants.schema import activate
+from users.models import Librarian
+
+
+class Command(BaseCommand):
+    help = "Import books or members for a librarian from a CSV or XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path", help="CSV or XLSX file whose first row holds the column names.")
+        parser.add_argument("--librarian", required=True, help="Email of the librarian who owns the imported rows.")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument("--schema", help="Schema of the tenant the librarian belongs to, public by default.")
+
+    def handle(self, *args, **options):
+        activate(options["schema"])
+        try:
+            librarian = Librarian.objects.get(email=options["librarian"])
+        except Librarian.DoesNotExist:
+            raise CommandError(f"Librarian {options['librarian']} does not exist.")
+
+        try:
+            with open(options["path"], "rb") as file:
+                result = import_catalog(
+                    librarian, options["kind"], read_rows(file, options["path"]), options["chunk_size"]
+                )
+        except (OSError, ImportFormatError) as e:
+            raise CommandError(str(e))
+
+        for row_number, message in result.errors:
+            self.stderr.write(f"Row {row_number}: {message}")
+        summary = f"Imported {result.created} {options['kind']}, {len(result.errors)} errors."
+        self.stdout.write(self.style.SUCCESS(summary))
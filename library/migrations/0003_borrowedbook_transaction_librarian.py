@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='borrowedbook',
+            name='librarian',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='borrowed_books', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='librarian',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='category',
+            field=models.CharField(choices=[('adventure', 'Adventure - Phiêu lưu'), ('art', 'Art/Photography - Nghệ thuật/Nhiếp ảnh'), ('biography', 'Biography - Tiểu sử'), ('children', 'Children - Thiếu nhi'), ('cooking', 'Cooking/Culinary - Ẩm thực'), ('diy', 'DIY/Crafts - Tự làm/Thủ công'), ('drama', 'Drama - Kịch'), ('economics', 'Economics - Kinh tế'), ('education', 'Education/Academic - Giáo dục/Học thuật'), ('environmental', 'Environmental - Môi trường'), ('fantasy', 'Fantasy - Kỳ ảo'), ('fashion', 'Fashion - Thời trang'), ('fiction', 'Fiction - Tiểu thuyết'), ('gardening', 'Gardening - Làm vườn'), ('graphic-novels', 'Graphic Novels/Comics - Truyện tranh'), ('health', 'Health & Wellness - Sức khỏe'), ('history', 'History - Lịch sử'), ('horror', 'Horror - Kinh dị'), ('humor', 'Humor - Hài hước'), ('legal', 'Legal - Pháp luật'), ('memoirs', 'Memoirs - Hồi ký'), ('mystery', 'Mystery/Crime - Trinh thám'), ('music', 'Music - Âm nhạc'), ('non-fiction', 'Non-Fiction - Phi hư cấu'), ('other', 'Other - Khác'), ('pets', 'Pets/Animals - Thú cưng/Động vật'), ('philosophy', 'Philosophy - Triết học'), ('poetry', 'Poetry - Thơ'), ('psychology', 'Psychology - Tâm lý học'), ('religion', 'Religion - Tôn giáo'), ('romance', 'Romance - Lãng mạn'), ('science', 'Science - Khoa học'), ('sci-fi', 'Science Fiction - Khoa học viễn tưởng'), ('self-help', 'Self-Help - Phát triển bản thân'), ('spirituality', 'Spirituality - Tâm linh'), ('sports', 'Sports - Thể thao'), ('technology', 'Technology - Công nghệ'), ('thriller', 'Thriller/Suspense - Giật gân'), ('travel', 'Travel - Du lịch'), ('war', 'War/Military - Chiến tranh/Quân sự')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='payment_method',
+            field=models.CharField(choices=[('cash', 'Tiền mặt'), ('momo', 'Momo'), ('card', 'Thẻ ngân hàng'), ('zalopay', 'Zalo Pay')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:30
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_librarian(apps, schema_editor):
+    Book = apps.get_model("library", "Book")
+    BorrowedBook = apps.get_model("library", "BorrowedBook")
+    Member = apps.get_model("library", "Member")
+    Transaction = apps.get_model("library", "Transaction")
+
+    BorrowedBook.objects.filter(librarian__isnull=True).update(
+        librarian=Subquery(Book.objects.filter(pk=OuterRef("book_id")).values("librarian")[:1])
+    )
+    Transaction.objects.filter(librarian__isnull=True).update(
+        librarian=Subquery(Member.objects.filter(pk=OuterRef("member_id")).values("librarian")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0003_borrowedbook_transaction_librarian'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_librarian, migrations.RunPython.noop),
+    ]
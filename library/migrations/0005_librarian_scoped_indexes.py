@@ -0,0 +1,58 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0004_backfill_librarian'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='borrowedbook',
+            name='librarian',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='borrowed_books', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='librarian',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['librarian', 'created_at', 'id'], name='book_librarian_page'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['librarian', 'created_at', 'id'], name='borrowedbook_librarian_page'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['librarian', 'returned', 'return_date'], name='borrowedbook_librarian_due'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(condition=models.Q(('returned', False)), fields=['librarian', 'return_date'], name='borrowedbook_unreturned_due'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(condition=models.Q(('returned', False)), fields=['member', 'return_date'], name='borrowedbook_member_unreturned'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['librarian', 'name'], name='member_librarian_name'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['librarian', 'created_at', 'id'], name='member_librarian_page'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['librarian', 'created_at', 'id'], name='transaction_librarian_page'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:50
+
+from django.db import migrations
+
+# Every column holding a "<model>-<uuid4>" key. Keeping only the trailing 36 characters leaves the bare UUID, which
+# the following migrations cast to the native uuid type. Foreign keys are deferred, so keys and references can be
+# rewritten in any order within this transaction.
+ID_COLUMNS = [
+    ("users_librarian", "id"),
+    ("users_librarian_groups", "librarian_id"),
+    ("users_librarian_user_permissions", "librarian_id"),
+    ("django_admin_log", "user_id"),
+    ("library_member", "id"),
+    ("library_member", "librarian_id"),
+    ("library_book", "id"),
+    ("library_book", "librarian_id"),
+    ("library_borrowedbook", "id"),
+    ("library_borrowedbook", "member_id"),
+    ("library_borrowedbook", "book_id"),
+    ("library_borrowedbook", "librarian_id"),
+    ("library_transaction", "id"),
+    ("library_transaction", "member_id"),
+    ("library_transaction", "librarian_id"),
+]
+
+PREFIX_PATTERN = "^(librarian|member|book|borrowedbook|transaction)-"
+
+
+def strip_id_prefixes(apps, schema_editor):
+    quote_name = schema_editor.quote_name
+    for table, column in ID_COLUMNS:
+        schema_editor.execute(
+            f"UPDATE {quote_name(table)} SET {quote_name(column)} = right({quote_name(column)}, 36) "
+            f"WHERE {quote_name(column)} ~ %s",
+            [PREFIX_PATTERN],
+        )
+    # Admin history refers to objects by their key as text.
+    schema_editor.execute(
+        "UPDATE django_admin_log SET object_id = right(object_id, 36) WHERE object_id ~ %s", [PREFIX_PATTERN]
+    )
+    # Sessions store the old librarian key, which no longer parses as a primary key, so everyone signs in again.
+    apps.get_model("sessions", "Session").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0006_full_text_search'),
+        ('users', '0001_initial'),
+        ('admin', '0003_logentry_add_action_flag_choices'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(strip_id_prefixes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:42
+
+import users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0007_strip_id_prefixes'),
+        ('users', '0002_uuid_primary_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='id',
+            field=models.UUIDField(default=users.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='borrowedbook',
+            name='id',
+            field=models.UUIDField(default=users.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='member',
+            name='id',
+            field=models.UUIDField(default=users.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='id',
+            field=models.UUIDField(default=users.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def clear_returned_loans(apps, schema_editor):
+    # fine_accrued stayed set after a return, is_overdue doesn't.
+    BorrowedBook = apps.get_model("library", "BorrowedBook")
+    BorrowedBook.objects.filter(returned=True, is_overdue=True).update(is_overdue=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0010_fine_accrual'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='borrowedbook',
+            name='borrowedbook_fine_pending',
+        ),
+        migrations.RenameField(
+            model_name='borrowedbook',
+            old_name='fine_accrued',
+            new_name='is_overdue',
+        ),
+        migrations.RunPython(clear_returned_loans, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(condition=models.Q(('is_overdue', False), ('returned', False)), fields=['return_date'], name='borrowedbook_overdue_pending'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(condition=models.Q(('is_overdue', True)), fields=['librarian', 'created_at', 'id'], include=('fine',), name='borrowedbook_librarian_overdue'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+class LibrarianQuerysetMixin:
+    """
+    Build the queryset of a list, export or API view from its class attributes: the logged-in Librarian's rows of
+    ``model`` matching ``filters``, narrowed down by the search query with ``search``, e.g. search_books().
+    """
+
+    model = None
+    filters = {}
+    select_related = ()
+    search = None
+
+    def get_queryset(self, request, query=None):
+        queryset = self.model.objects.filter(librarian=request.user, **self.filters)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if query:
+            queryset = self.search(queryset, query)
+        return queryset
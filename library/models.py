@@ -1,6 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.utils import timezone
+from django.db.models import Q
 
 from users.models import AbstractBaseModel
 
@@ -54,6 +56,10 @@ CATEGORY_CHOICES = (
 
 
 
+# Text search configuration created in migration 0006: the "simple" parser with diacritics stripped by unaccent,
+# so "nguyen" matches "Nguyễn".
+SEARCH_CONFIG = "library_unaccent"
+
 PAYMENT_METHOD_CHOICES = (
     ("cash", "Tiền mặt"),
     ("momo", "Momo"),
@@ -70,18 +76,26 @@ class Member(AbstractBaseModel):
         max_digits=10, decimal_places=2, default=0.00, validators=[MinValueValidator(0.00), MaxValueValidator(500.00)]
     )
     librarian = models.ForeignKey('users.Librarian', on_delete=models.CASCADE, related_name='members')
+    search_vector = models.GeneratedField(
+        expression=SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("email", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["librarian", "name"], name="member_librarian_name"),
+            models.Index(fields=["librarian", "created_at", "id"], name="member_librarian_page"),
+            # Adding and importing members look up whether an email is already taken.
+            models.Index(fields=["email"], name="member_email"),
+            GinIndex(fields=["search_vector"], name="member_search_vector"),
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="member_name_trgm"),
+        ]
 
     def __str__(self):
         return f"{self.name}"
 
-    def calculate_amount_due(self):
-        borrowed_books = self.borrowed_books.all()
-        amount = 0
-        for book in borrowed_books:
-            if book.return_date < timezone.now().date() and not book.returned:
-                amount += book.fine
-        return amount
-
     def save(self, *args, **kwargs):
         if not self.librarian:
             raise ValueError("Each member must be associated with a librarian.")
@@ -98,6 +112,20 @@ class Book(AbstractBaseModel):
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="available")
     librarian = models.ForeignKey('users.Librarian', on_delete=models.CASCADE, related_name="books")  # Thêm trường này
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("author", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["librarian", "created_at", "id"], name="book_librarian_page"),
+            GinIndex(fields=["search_vector"], name="book_search_vector"),
+            GinIndex(fields=["title"], opclasses=["gin_trgm_ops"], name="book_title_trgm"),
+            GinIndex(fields=["author"], opclasses=["gin_trgm_ops"], name="book_author_trgm"),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -108,6 +136,39 @@ class BorrowedBook(AbstractBaseModel):
     return_date = models.DateField()
     returned = models.BooleanField(default=False)
     fine = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, validators=[MinValueValidator(0.00)])
+    # Denormalized from book.librarian so librarian-scoped loan queries don't join through Book.
+    librarian = models.ForeignKey(
+        'users.Librarian', on_delete=models.CASCADE, related_name="borrowed_books", editable=False
+    )
+    # Unreturned and past the return date, as of the last daily rollover. While set, the loan's fine is counted in
+    # the member's amount_due, see library.fines.
+    is_overdue = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["librarian", "created_at", "id"], name="borrowedbook_librarian_page"),
+            models.Index(fields=["librarian", "returned", "return_date"], name="borrowedbook_librarian_due"),
+            # Overdue lookups only ever look at unreturned loans, which stay a small slice of the table.
+            models.Index(
+                fields=["librarian", "return_date"], condition=Q(returned=False), name="borrowedbook_unreturned_due"
+            ),
+            models.Index(
+                fields=["member", "return_date"], condition=Q(returned=False), name="borrowedbook_member_unreturned"
+            ),
+            # Loans the daily rollover still has to check.
+            models.Index(
+                fields=["return_date"],
+                condition=Q(returned=False, is_overdue=False),
+                name="borrowedbook_overdue_pending",
+            ),
+            # Overdue listing, counts and totals per librarian, without visiting the table for the totals.
+            models.Index(
+                fields=["librarian", "created_at", "id"],
+                include=["fine"],
+                condition=Q(is_overdue=True),
+                name="borrowedbook_librarian_overdue",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.member.name} borrowed {self.book.title} on {self.created_at}"
@@ -115,6 +176,7 @@ class BorrowedBook(AbstractBaseModel):
     def save(self, *args, **kwargs):
         if not self.member.librarian == self.book.librarian:
             raise ValueError("A member can only borrow books from their assigned librarian.")
+        self.librarian_id = self.book.librarian_id
         super().save(*args, **kwargs)
 
 
@@ -124,11 +186,35 @@ class Transaction(AbstractBaseModel):
     member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="transactions")
     amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, validators=[MinValueValidator(0.00)])
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES)
+    # Denormalized from member.librarian so librarian-scoped payment queries don't join through Member.
+    librarian = models.ForeignKey(
+        'users.Librarian', on_delete=models.CASCADE, related_name="transactions", editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["librarian", "created_at", "id"], name="transaction_librarian_page"),
+        ]
 
     def __str__(self):
         return f"{self.member.name} paid {self.amount} via {self.payment_method}"
 
     def save(self, *args, **kwargs):
-        if not self.member.librarian == self.librarian:
+        if not self.librarian_id:
+            self.librarian_id = self.member.librarian_id
+        if not self.member.librarian_id == self.librarian_id:
             raise ValueError("A transaction must belong to a librarian that owns the member.")
         super().save(*args, **kwargs)
+
+
+class Watermark(models.Model):
+    """
+    How far a batch job has got, so the next run only has to process what came after.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.DateField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
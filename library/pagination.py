@@ -0,0 +1,162 @@
+import base64
+import binascii
+import json
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_ORDERING = ("created_at", "pk")
+RANKED_ORDERING = ("rank", "created_at", "pk")
+
+
+def encode_cursor(obj, ordering=DEFAULT_ORDERING):
+    values = [getattr(obj, field) for field in ordering]
+    # str() keeps the microseconds of datetimes, which DjangoJSONEncoder would truncate and so skip or repeat rows.
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor, model, ordering=DEFAULT_ORDERING):
+    """
+    Decode a cursor into the values of the ordering fields of its boundary row, converted to the types of the fields
+    of model, the search rank being a float.
+    Returns None for a missing or malformed cursor so the first page is served instead.
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering) or None in values:
+        return None
+    try:
+        return [_to_python(model, field, value) for field, value in zip(ordering, values)]
+    except (ValidationError, TypeError, ValueError):
+        return None
+
+
+def _to_python(model, field, value):
+    if field == "rank":
+        return float(value)
+    field = model._meta.pk if field == "pk" else model._meta.get_field(field)
+    return field.to_python(value)
+
+
+def keyset_filter(ordering, values, lookup):
+    """
+    Build the filter selecting rows past the boundary row in the given direction ("lt" or "gt"):
+    (a < x) OR (a = x AND b < y) OR (a = x AND b = y AND c < z) ...
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        condition |= Q(**dict(zip(ordering[:i], values[:i])), **{f"{field}__{lookup}": values[i]})
+    return condition
+
+
+def get_page_size(request):
+    try:
+        page_size = int(request.GET.get("page_size", settings.LIST_PAGE_SIZE))
+    except ValueError:
+        page_size = settings.LIST_PAGE_SIZE
+    return max(1, min(page_size, settings.LIST_MAX_PAGE_SIZE))
+
+
+class KeysetPage:
+    """
+    A page of a queryset ordered descending on its ordering fields, newest first by (created_at, pk) by default.
+    Links carry the position of the boundary rows rather than an offset, so pages stay stable while rows are added
+    and fetching any page costs an index range scan of page_size rows.
+    """
+
+    def __init__(self, object_list, page_size, has_next, has_previous, params, ordering=DEFAULT_ORDERING):
+        self.object_list = object_list
+        self.page_size = page_size
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.params = params
+        self.ordering = ordering
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _url(self, **cursor):
+        return "?" + urlencode({**self.params, **cursor})
+
+    @property
+    def next_url(self):
+        if self.has_next and self.object_list:
+            return self._url(after=encode_cursor(self.object_list[-1], self.ordering))
+
+    @property
+    def previous_url(self):
+        if self.has_previous and self.object_list:
+            return self._url(before=encode_cursor(self.object_list[0], self.ordering))
+
+
+def paginate(request, queryset, query=None):
+    """
+    Return the keyset page of queryset selected by the ``after``/``before`` cursors in the query string.
+    Search results annotated with a ``rank`` are paged best match first.
+    The search query, if any, is carried into the page links so searches can be paged as well.
+    """
+    rows, build_page = _page_query(request, queryset, query)
+    return build_page(list(rows))
+
+
+async def apaginate(request, queryset, query=None):
+    """
+    Async version of paginate(), fetching the rows with the async ORM.
+    """
+    rows, build_page = _page_query(request, queryset, query)
+    return build_page([row async for row in rows])
+
+
+def _page_query(request, queryset, query):
+    """
+    Return the query for the requested page, which fetches one row more to tell whether there is a page past it, and
+    the function building the KeysetPage from its rows.
+    """
+    ordering = RANKED_ORDERING if "rank" in queryset.query.annotations else DEFAULT_ORDERING
+    page_size = get_page_size(request)
+    after = decode_cursor(request.GET.get("after"), queryset.model, ordering)
+    before = decode_cursor(request.GET.get("before"), queryset.model, ordering)
+
+    params = {}
+    if query:
+        params["query"] = query
+    if "page_size" in request.GET:
+        params["page_size"] = page_size
+
+    if before:
+        queryset = queryset.filter(keyset_filter(ordering, before, "gt")).order_by(*ordering)
+
+        def build_page(rows):
+            has_previous = len(rows) > page_size
+            rows = rows[:page_size][::-1]
+            return KeysetPage(
+                rows, page_size, has_next=True, has_previous=has_previous, params=params, ordering=ordering
+            )
+
+        return queryset[: page_size + 1], build_page
+
+    queryset = queryset.order_by(*(f"-{field}" for field in ordering))
+    if after:
+        queryset = queryset.filter(keyset_filter(ordering, after, "lt"))
+
+    def build_page(rows):
+        has_next = len(rows) > page_size
+        return KeysetPage(
+            rows[:page_size],
+            page_size,
+            has_next=has_next,
+            has_previous=after is not None,
+            params=params,
+            ordering=ordering,
+        )
+
+    return queryset[: page_size + 1], build_page
@@ -0,0 +1,61 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import close_old_connections
+
+from tenants.routing import get_schemas
+from tenants.schema import tenant_schema
+
+from .fines import accrue_fines
+
+logger = logging.getLogger(__name__)
+
+
+def _run_fine_accrual(interval):
+    while True:
+        try:
+            for schema_name in get_schemas():
+                try:
+                    with tenant_schema(schema_name):
+                        accrue_fines()
+                except Exception:
+                    logger.exception(f"Fine accrual failed in schema {schema_name or 'public'}.")
+        except Exception:
+            logger.exception("Fine accrual failed.")
+        finally:
+            close_old_connections()
+        time.sleep(interval)
+
+
+def start_scheduler():
+    """
+    Run the fine accrual job of every schema every FINE_ACCRUAL_INTERVAL seconds in a background thread of this
+    process, for deployments without cron. Once the day's fines are accrued a run only reads the watermarks, and runs
+    from several processes don't overlap, so every worker can start it.
+    The thread is started by the first request the process serves rather than right away, so a server that loads the
+    application before forking its workers, like gunicorn with preload_app, doesn't fork a running thread.
+    """
+    if settings.FINE_ACCRUAL_SCHEDULER:
+        request_started.connect(_start_thread, dispatch_uid="fine-accrual-scheduler")
+
+
+_scheduler_pid = None
+_scheduler_lock = threading.Lock()
+
+
+def _start_thread(**kwargs):
+    global _scheduler_pid
+    with _scheduler_lock:
+        if _scheduler_pid == os.getpid():
+            return
+        _scheduler_pid = os.getpid()
+
+    thread = threading.Thread(
+        target=_run_fine_accrual, args=(settings.FINE_ACCRUAL_INTERVAL,), name="fine-accrual", daemon=True
+    )
+    thread.start()
+    logger.info(f"Fine accrual scheduled every {settings.FINE_ACCRUAL_INTERVAL} seconds.")
@@ -0,0 +1,40 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast, Greatest
+
+from .models import SEARCH_CONFIG
+
+
+def search(queryset, query, vector, trigram_fields):
+    """
+    Filter queryset to the rows matching query and annotate them with a ``rank``.
+    A row matches when its search vector matches the query, or when one of the trigram fields is similar to it,
+    which catches typos and partial words. Both lookups are served by GIN indexes.
+    """
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    similarities = [TrigramSimilarity(field, query) for field in trigram_fields]
+
+    match = Q(**{vector: search_query})
+    for field in trigram_fields:
+        match |= Q(**{f"{field}__trigram_similar": query})
+
+    similarity = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+    # Cast to double precision so the rank round-trips exactly through pagination cursors.
+    rank = Cast(SearchRank(F(vector), search_query) + similarity, FloatField())
+    return queryset.filter(match).annotate(rank=rank)
+
+
+def search_books(queryset, query):
+    return search(queryset, query, "search_vector", ["title", "author"])
+
+
+def search_members(queryset, query):
+    return search(queryset, query, "search_vector", ["name"])
+
+
+def search_borrowed_books(queryset, query):
+    return search(queryset, query, "book__search_vector", ["book__title", "book__author"])
+
+
+def search_payments(queryset, query):
+    return search(queryset, query, "member__search_vector", ["member__name"])
@@ -1,12 +1,27 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from library.models import BorrowedBook
+from library.cache import bump_librarian_version
+from library.fines import accrue_loans, adjust_amount_due, is_past_due, owed_fine
+from library.models import Book, BorrowedBook, Member, Transaction
 
 
-@receiver(pre_save, sender=BorrowedBook)
-def update_book_quantity_on_borrowing(sender, instance, **kwargs):
-    if instance.book.quantity > 1:
-        instance.book.status = "available"
-    else:
-        instance.book.status = "not-available"
+@receiver([post_save, post_delete], sender=Book)
+@receiver([post_save, post_delete], sender=Member)
+@receiver([post_save, post_delete], sender=BorrowedBook)
+@receiver([post_save, post_delete], sender=Transaction)
+def invalidate_cache_on_librarian_change(sender, instance, **kwargs):
+    bump_librarian_version(instance.librarian_id)
+
+
+@receiver(post_delete, sender=BorrowedBook)
+def release_fine_on_loan_delete(sender, instance, **kwargs):
+    # Also covers loans deleted along with their book.
+    adjust_amount_due(instance.member_id, -owed_fine(instance))
+
+
+@receiver(post_save, sender=BorrowedBook)
+def flag_overdue_on_loan_create(sender, instance, created, **kwargs):
+    # Later loans become overdue through the daily rollover in accrue_fines().
+    if created and not instance.returned and is_past_due(instance.return_date):
+        accrue_loans([instance.pk])
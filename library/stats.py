@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from users.models import Librarian
+
+from .cache import aget_librarian_version
+from .fines import aensure_fines_accrued
+from .models import Book, BorrowedBook, Member, Transaction
+
+DASHBOARD_STATS_KEY = "library:dashboard-stats:{librarian_id}:{version}"
+
+
+def _scalar(queryset, group_by, aggregate, output_field):
+    """
+    Wrap an aggregate over a librarian-scoped queryset as a scalar subquery.
+    Empty sets yield NULL in SQL, so the value is coalesced to zero.
+    """
+    subquery = queryset.order_by().values(group_by).annotate(value=aggregate).values("value")
+    return Coalesce(Subquery(subquery, output_field=output_field), Value(0), output_field=output_field)
+
+
+def _dashboard_stats_query(librarian_id):
+    """
+    Query the dashboard counters and amounts for a librarian as a single row.
+    Every figure is evaluated by the database as a correlated subquery on the librarian row.
+    """
+    count_field = IntegerField()
+    amount_field = DecimalField(max_digits=12, decimal_places=2)
+
+    borrowed_books = BorrowedBook.objects.filter(librarian=OuterRef("pk"), returned=False)
+    overdue_books = BorrowedBook.objects.filter(librarian=OuterRef("pk"), is_overdue=True)
+
+    return (
+        Librarian.objects.filter(pk=librarian_id)
+        .annotate(
+            total_members=_scalar(
+                Member.objects.filter(librarian=OuterRef("pk")), "librarian", Count("pk"), count_field
+            ),
+            total_books=_scalar(Book.objects.filter(librarian=OuterRef("pk")), "librarian", Count("pk"), count_field),
+            total_borrowed_books=_scalar(borrowed_books, "librarian", Count("pk"), count_field),
+            total_overdue_books=_scalar(overdue_books, "librarian", Count("pk"), count_field),
+            total_amount=_scalar(
+                Transaction.objects.filter(librarian=OuterRef("pk")), "librarian", Sum("amount"), amount_field
+            ),
+            overdue_amount=_scalar(overdue_books, "librarian", Sum("fine"), amount_field),
+        )
+        .values(
+            "total_members",
+            "total_books",
+            "total_borrowed_books",
+            "total_overdue_books",
+            "total_amount",
+            "overdue_amount",
+        )
+    )
+
+
+async def acompute_dashboard_stats(librarian_id):
+    """
+    Compute the dashboard counters and amounts for a librarian in a single query.
+    """
+    await aensure_fines_accrued()
+    today = timezone.now().date()
+    stats = await _dashboard_stats_query(librarian_id).afirst()
+    stats["date"] = today
+    return stats
+
+
+async def aget_dashboard_stats(librarian_id):
+    """
+    Return the dashboard stats for a librarian, served from the cache when possible.
+    The key holds the librarian's data version, so any change to their books, members, loans or payments moves on to
+    a fresh entry. Cached stats are discarded once the day rolls over because overdue figures depend on the date.
+    Set DASHBOARD_STATS_CACHE_TIMEOUT to 0 to disable caching.
+    """
+    timeout = settings.DASHBOARD_STATS_CACHE_TIMEOUT
+    if not timeout:
+        return await acompute_dashboard_stats(librarian_id)
+
+    key = DASHBOARD_STATS_KEY.format(librarian_id=librarian_id, version=await aget_librarian_version(librarian_id))
+    stats = await cache.aget(key)
+    if stats is None or stats["date"] != timezone.now().date():
+        stats = await acompute_dashboard_stats(librarian_id)
+        await cache.aset(key, stats, timeout)
+    return stats
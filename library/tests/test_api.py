@@ -0,0 +1,162 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from library.fines import accrue_fines
+from library.models import Book, BorrowedBook, Member, Transaction
+from users.models import Librarian
+
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.books = [
+            Book.objects.create(
+                title=f"Title {i}", author="Author", category="fiction", quantity=2, borrowing_fee=3,
+                librarian=self.user,
+            )
+            for i in range(3)
+        ]
+        self.client.force_login(self.user)
+
+    def post(self, url_name, data):
+        return self.client.post(reverse(url_name), data, content_type="application/json")
+
+
+class TestApiLists(ApiTestCase):
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("v1:books"))
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_books_are_paged_newest_first(self):
+        other_member = Member.objects.create(name="Other", email="other-member@gmail.com", librarian=self.other_user)
+        Book.objects.create(title="Other", author="Author", category="fiction", librarian=self.other_user)
+        BorrowedBook.objects.create(member=other_member, book=Book.objects.get(title="Other"), return_date="2999-12-12")
+
+        response = self.client.get(reverse("v1:books"), {"page_size": 2})
+        data = response.json()
+
+        self.assertEqual([book["title"] for book in data["results"]], ["Title 2", "Title 1"])
+        self.assertIsNone(data["previous"])
+
+        data = self.client.get(data["next"]).json()
+        self.assertEqual([book["title"] for book in data["results"]], ["Title 0"])
+        self.assertIsNone(data["next"])
+
+    def test_loans_can_be_filtered(self):
+        loan = BorrowedBook.objects.create(member=self.member, book=self.books[0], return_date="2999-12-12")
+        BorrowedBook.objects.create(member=self.member, book=self.books[1], return_date="2999-12-12", returned=True)
+
+        data = self.client.get(reverse("v1:loans"), {"member": self.member.pk, "returned": "false"}).json()
+        self.assertEqual([row["id"] for row in data["results"]], [str(loan.pk)])
+
+        response = self.client.get(reverse("v1:loans"), {"member": "not-a-uuid"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_members_and_payments(self):
+        Transaction.objects.create(member=self.member, amount=10, payment_method="cash")
+
+        members = self.client.get(reverse("v1:members")).json()["results"]
+        payments = self.client.get(reverse("v1:payments")).json()["results"]
+
+        self.assertEqual([member["email"] for member in members], ["member@gmail.com"])
+        self.assertEqual([(payment["amount"], payment["payment_method"]) for payment in payments], [("10.00", "cash")])
+
+
+class TestBulkLend(ApiTestCase):
+    def lend(self, **data):
+        return self.post(
+            "v1:bulk-lend",
+            {
+                "member": str(self.member.pk),
+                "books": [str(book.pk) for book in self.books],
+                "return_date": "2999-12-12",
+                "fine": "5.00",
+                "payment_method": "cash",
+                **data,
+            },
+        )
+
+    def test_basket_is_lent_in_one_request(self):
+        with self.assertNumQueries(9):
+            response = self.lend()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["loans"]), 3)
+        self.assertEqual(response.json()["payment"]["amount"], "9.00")
+        self.assertEqual(list(Book.objects.values_list("quantity", flat=True).distinct()), [1])
+
+    def test_nothing_is_lent_if_a_book_is_unavailable(self):
+        Book.objects.filter(pk=self.books[2].pk).update(quantity=0)
+
+        response = self.lend()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("__all__", response.json()["errors"])
+        self.assertFalse(BorrowedBook.objects.exists())
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).quantity, 2)
+
+    def test_invalid_requests(self):
+        other_book = Book.objects.create(title="Other", author="Author", category="fiction", librarian=self.other_user)
+
+        self.assertIn("books", self.lend(books=[str(other_book.pk)]).json()["errors"])
+        with override_settings(API_MAX_BATCH_SIZE=2):
+            self.assertEqual(self.lend().json()["errors"]["books"][0]["code"], "batch_too_large")
+        response = self.client.post(reverse("v1:bulk-lend"), "[]", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+class TestBulkReturn(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.now().date()
+        self.loans = [
+            BorrowedBook.objects.create(
+                member=self.member, book=book, return_date=self.today + datetime.timedelta(days=7), fine=5
+            )
+            for book in self.books
+        ]
+        Book.objects.update(quantity=1)
+
+    def return_loans(self, loans, **data):
+        return self.post("v1:bulk-return", {"loans": [str(loan.pk) for loan in loans], **data})
+
+    def test_loans_are_returned_in_one_request(self):
+        with self.assertNumQueries(7):
+            response = self.return_loans(self.loans)
+
+        self.assertEqual(len(response.json()["returned"]), 3)
+        self.assertEqual(BorrowedBook.objects.filter(returned=True).count(), 3)
+        self.assertEqual(list(Book.objects.values_list("quantity", "status").distinct()), [(2, "available")])
+
+    def test_already_returned_loans_are_skipped(self):
+        self.return_loans(self.loans[:1])
+
+        data = self.return_loans(self.loans).json()
+
+        self.assertEqual(len(data["returned"]), 2)
+        self.assertEqual(data["skipped"], [str(self.loans[0].pk)])
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).quantity, 2)
+
+    def test_overdue_fines_are_paid_on_return(self):
+        BorrowedBook.objects.filter(pk__in=[loan.pk for loan in self.loans[:2]]).update(return_date="2021-12-12")
+        accrue_fines(full=True)
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.amount_due, 10)
+
+        response = self.return_loans(self.loans)
+        self.assertIn("payment_method", response.json()["errors"])
+        self.assertFalse(BorrowedBook.objects.filter(returned=True).exists())
+
+        response = self.return_loans(self.loans, payment_method="momo")
+        self.assertEqual(len(response.json()["returned"]), 3)
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.amount_due, 0)
+        payment = Transaction.objects.get()
+        self.assertEqual((payment.amount, payment.payment_method, payment.librarian), (10, "momo", self.user))
@@ -1,7 +1,8 @@
 from django.test import TestCase
 from django.urls import reverse
 
-from library.models import Book, BorrowedBook, Member
+from library.lending import BookUnavailableError, lend_books
+from library.models import Book, BorrowedBook, Member, Transaction
 from users.models import Librarian
 
 
@@ -192,3 +193,75 @@ class TestDeleteLentBookView(TestCase):
         self.book.refresh_from_db()
         self.assertEqual(BorrowedBook.objects.count(), 0)
         self.assertEqual(self.book.quantity, 11)
+
+
+class TestLendBooks(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.books = [
+            Book.objects.create(
+                title=f"Test Title {i}",
+                author="Test Author",
+                category="fiction",
+                quantity=i + 1,
+                borrowing_fee=2.00,
+                librarian=self.user,
+            )
+            for i in range(3)
+        ]
+        self.client.force_login(self.user)
+
+    def lend(self, books):
+        return lend_books(self.user, self.member, [book.pk for book in books], "2999-12-12", 5.00, "cash")
+
+    def test_lend_books_via_view(self):
+        data = {
+            "book": [book.pk for book in self.books],
+            "member": self.member.pk,
+            "return_date": "2999-12-12",
+            "fine": 5.00,
+            "payment_method": "cash",
+        }
+        response = self.client.post(reverse("lend-book"), data)
+
+        self.assertRedirects(response, reverse("lent-books"))
+        self.assertEqual(BorrowedBook.objects.filter(member=self.member).count(), 3)
+        self.assertEqual(Transaction.objects.get(member=self.member).amount, 6)
+
+    def test_invalid_book_ids_are_form_errors(self):
+        other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+        other_book = Book.objects.create(title="Other", author="Author", category="fiction", librarian=other_user)
+        data = {"member": self.member.pk, "return_date": "2999-12-12", "fine": 5.00, "payment_method": "cash"}
+
+        for book_ids in (["not-a-uuid"], [other_book.pk]):
+            response = self.client.post(reverse("lend-book"), {**data, "book": [self.books[0].pk, *book_ids]})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.context["form"].errors["book"])
+        self.assertFalse(BorrowedBook.objects.exists())
+
+    def test_quantity_and_status_are_updated(self):
+        self.lend(self.books)
+
+        for book in self.books:
+            book.refresh_from_db()
+        self.assertEqual([book.quantity for book in self.books], [0, 1, 2])
+        self.assertEqual([book.status for book in self.books], ["not-available", "available", "available"])
+
+    def test_query_count_does_not_depend_on_book_count(self):
+        with self.assertNumQueries(6):
+            self.lend(self.books[:1])
+        with self.assertNumQueries(6):
+            self.lend(self.books[1:])
+
+    def test_unavailable_book_lends_nothing(self):
+        self.lend(self.books[:1])
+
+        with self.assertRaises(BookUnavailableError):
+            self.lend(self.books)
+
+        self.books[1].refresh_from_db()
+        self.assertEqual(self.books[1].quantity, 2)
+        self.assertEqual(BorrowedBook.objects.count(), 1)
+        self.assertEqual(Transaction.objects.count(), 1)
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 
-from library.models import Book
+from library.models import Book, BorrowedBook, Member, Transaction
 from users.models import Librarian
 
 
@@ -158,3 +158,46 @@ class TestDeleteBookView(TestCase):
 
         self.assertEqual(Book.objects.count(), 1)
         self.assertFalse(Book.objects.filter(pk=self.book.pk).exists())
+
+
+class TestDenormalizedLibrarian(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+
+    def test_borrowed_book_takes_librarian_from_book(self):
+        borrowed_book = BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2024-12-12")
+
+        self.assertEqual(borrowed_book.librarian, self.user)
+
+    def test_transaction_takes_librarian_from_member(self):
+        transaction = Transaction.objects.create(member=self.member, amount=1.00, payment_method="cash")
+
+        self.assertEqual(transaction.librarian, self.user)
+
+    def test_transaction_rejects_foreign_librarian(self):
+        other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+
+        with self.assertRaises(ValueError):
+            Transaction.objects.create(member=self.member, amount=1.00, payment_method="cash", librarian=other_user)
+
+
+class TestLegacyBookLinks(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+
+    def test_prefixed_key_resolves_to_book(self):
+        self.client.force_login(self.user)
+        response = self.client.get(f"/edit-book-details/book-{self.book.pk}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["book"], self.book)
+
+    def test_links_use_bare_key(self):
+        self.assertEqual(reverse("update-book", kwargs={"pk": self.book.pk}), f"/edit-book-details/{self.book.pk}/")
@@ -0,0 +1,78 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from library.cache import bump_librarian_version, get_librarian_version
+from library.models import Book, Member
+from users.models import Librarian
+
+
+class TestLibrarianVersion(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+
+    def test_bump_only_moves_own_version(self):
+        version = get_librarian_version(self.user.pk)
+        other_version = get_librarian_version(self.other_user.pk)
+
+        bump_librarian_version(self.user.pk)
+
+        self.assertNotEqual(get_librarian_version(self.user.pk), version)
+        self.assertEqual(get_librarian_version(self.other_user.pk), other_version)
+
+    def test_global_bump_moves_every_version(self):
+        version = get_librarian_version(self.user.pk)
+        other_version = get_librarian_version(self.other_user.pk)
+
+        bump_librarian_version()
+
+        self.assertNotEqual(get_librarian_version(self.user.pk), version)
+        self.assertNotEqual(get_librarian_version(self.other_user.pk), other_version)
+
+    def test_version_is_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            bump_librarian_version(self.user.pk)
+        version = get_librarian_version(self.user.pk)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertNotEqual(get_librarian_version(self.user.pk), version)
+
+
+class TestCachedLists(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.client.force_login(self.user)
+
+    def test_list_page_is_cached_until_data_changes(self):
+        self.client.get(reverse("members"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("members"))
+        self.assertContains(response, "John Doe")
+
+        self.member.name = "Jane Doe"
+        self.member.save()
+        response = self.client.get(reverse("members"))
+
+        self.assertContains(response, "Jane Doe")
+        self.assertNotContains(response, "John Doe")
+
+    def test_search_results_are_cached_apart(self):
+        Member.objects.create(name="Jane Roe", email="jane@gmail.com", librarian=self.user)
+        self.client.get(reverse("members"))
+
+        response = self.client.get(reverse("members"), {"query": "Jane"})
+
+        self.assertContains(response, "Jane Roe")
+        self.assertNotContains(response, "John Doe")
+
+    def test_recently_added_books_fragment_is_refreshed(self):
+        self.client.get(reverse("home"))
+
+        Book.objects.create(title="New Title", author="New Author", category="fiction", quantity=1, librarian=self.user)
+        response = self.client.get(reverse("home"))
+
+        self.assertContains(response, "New Title")
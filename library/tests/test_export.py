@@ -0,0 +1,79 @@
+import csv
+import io
+
+from django.test import TestCase
+from django.urls import reverse
+
+from library.fines import accrue_fines
+from library.models import Book, BorrowedBook, Member, Transaction
+from users.models import Librarian
+
+
+async def read_stream(response):
+    return [chunk async for chunk in response.streaming_content]
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+        self.member = Member.objects.create(name="Trần Thị Bình", email="binh@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Truyện Kiều", author="Nguyễn Du", category="poetry", quantity=10, librarian=self.user
+        )
+        self.overdue = BorrowedBook.objects.create(
+            member=self.member, book=self.book, return_date="2021-12-12", fine=5
+        )
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2999-12-12")
+        Transaction.objects.create(member=self.member, amount=10, payment_method="cash")
+
+        other_member = Member.objects.create(name="Other", email="other-member@gmail.com", librarian=self.other_user)
+        Transaction.objects.create(member=other_member, amount=99, payment_method="card")
+        self.client.force_login(self.user)
+
+    def read_csv(self, chunks):
+        return list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+
+    def export(self, url_name, **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertTrue(response.streaming)
+        # The test client is served like a WSGI request, whose handler would buffer an async stream.
+        self.assertFalse(response.is_async)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        return self.read_csv(response.streaming_content)
+
+    async def test_export_is_streamed_asynchronously_over_asgi(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse("export-payments"))
+
+        self.assertTrue(response.is_async)
+        rows = self.read_csv(await read_stream(response))
+        self.assertEqual([row[1:5] for row in rows[1:]], [["Trần Thị Bình", "binh@gmail.com", "cash", "10.00"]])
+
+    def test_export_payments_only_includes_own_payments(self):
+        rows = self.export("export-payments")
+
+        self.assertEqual(rows[0][:2], ["ID", "Thanh toán bởi"])
+        self.assertEqual([row[1:5] for row in rows[1:]], [["Trần Thị Bình", "binh@gmail.com", "cash", "10.00"]])
+
+    def test_export_overdue_books(self):
+        rows = self.export("export-overdue-books")
+
+        self.assertEqual([row[0] for row in rows[1:]], [str(self.overdue.pk)])
+
+    def test_export_lent_books_with_search_query(self):
+        self.assertEqual(len(self.export("export-lent-books", query="kieu")), 3)
+        self.assertEqual(len(self.export("export-lent-books", query="khong co")), 1)
+
+    def test_export_members_includes_amount_due(self):
+        accrue_fines()
+        rows = self.export("export-members")
+
+        self.assertEqual([row[1:4] for row in rows[1:]], [["Trần Thị Bình", "binh@gmail.com", "5.00"]])
+
+    def test_export_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("export-payments"))
+
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,155 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from library.fines import accrue_fines
+from library.inventory import return_loan
+from library.lending import lend_books
+from library.models import Book, BorrowedBook, Member, Watermark
+from users.models import Librarian
+
+
+class TestFineAccrual(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+        self.today = timezone.now().date()
+
+    def lend(self, return_date, fine):
+        return BorrowedBook.objects.create(member=self.member, book=self.book, return_date=return_date, fine=fine)
+
+    def amount_due(self):
+        self.member.refresh_from_db()
+        return self.member.amount_due
+
+    def test_first_run_recomputes_balances(self):
+        Member.objects.filter(pk=self.member.pk).update(amount_due=42)
+        self.lend(self.today - datetime.timedelta(days=3), 5)
+        self.lend(self.today, 7)
+
+        self.assertEqual(accrue_fines(self.today), 1)
+        self.assertEqual(self.amount_due(), 5)
+        self.assertEqual(Watermark.objects.get(name="fines").value, self.today)
+
+    def test_reruns_are_incremental(self):
+        accrue_fines(self.today)
+        self.lend(self.today, 5)
+        self.lend(self.today + datetime.timedelta(days=1), 7)
+
+        self.assertIsNone(accrue_fines(self.today))
+        self.assertEqual(accrue_fines(self.today + datetime.timedelta(days=1)), 1)
+        self.assertEqual(self.amount_due(), 5)
+
+        # Fines are only added once, however many days a loan stays overdue.
+        self.assertEqual(accrue_fines(self.today + datetime.timedelta(days=5)), 1)
+        self.assertEqual(self.amount_due(), 12)
+
+    def test_return_and_delete_take_fine_off(self):
+        first = self.lend("2021-12-12", 5)
+        second = self.lend("2021-12-12", 7)
+        accrue_fines()
+
+        return_loan(first)
+        self.assertEqual(self.amount_due(), 7)
+
+        self.client.force_login(self.user)
+        self.client.get(reverse("delete-borrowed-book", kwargs={"pk": second.pk}))
+        self.assertEqual(self.amount_due(), 0)
+
+    def test_updating_return_date_adjusts_amount_due(self):
+        loan = self.lend("2021-12-12", 5)
+        accrue_fines()
+        self.client.force_login(self.user)
+
+        self.client.post(
+            reverse("edit-borrowed-book", kwargs={"pk": loan.pk}), {"return_date": "2999-12-12", "fine": 5}
+        )
+        self.assertEqual(self.amount_due(), 0)
+
+        self.client.post(
+            reverse("edit-borrowed-book", kwargs={"pk": loan.pk}), {"return_date": "2021-12-12", "fine": 8}
+        )
+        self.assertEqual(self.amount_due(), 8)
+
+    def test_members_over_limit_cannot_borrow(self):
+        self.lend("2021-12-12", 501)
+        accrue_fines()
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            reverse("lend-book"),
+            {
+                "book": self.book.pk,
+                "member": self.member.pk,
+                "return_date": "2999-12-12",
+                "fine": 0,
+                "payment_method": "cash",
+            },
+        )
+
+        self.assertIn("Member has exceeded the borrowing limit.", response.context["form"].non_field_errors())
+        self.assertEqual(BorrowedBook.objects.count(), 1)
+
+    def test_accrue_fines_command(self):
+        self.lend("2021-12-12", 5)
+        out = StringIO()
+
+        call_command("accrue_fines", stdout=out)
+        call_command("accrue_fines", stdout=out)
+
+        self.assertIn("Updated the amount due of 1 members.", out.getvalue())
+        self.assertIn("Fines are already accrued for today.", out.getvalue())
+        self.assertEqual(self.amount_due(), 5)
+
+
+class TestOverdueProjection(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+        self.today = timezone.now().date()
+        self.client.force_login(self.user)
+
+    def overdue_titles(self):
+        response = self.client.get(reverse("overdue-books"))
+        return [loan.book.title for loan in response.context["books"]]
+
+    def test_loans_created_past_due_are_overdue_at_once(self):
+        loan = BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12", fine=5)
+        lent, _ = lend_books(self.user, self.member, [self.book.pk], "2021-12-12", 3, "cash")
+
+        self.assertEqual(BorrowedBook.objects.filter(is_overdue=True).count(), 2)
+        self.assertEqual(len(self.overdue_titles()), 2)
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.amount_due, 8)
+
+        return_loan(loan)
+        self.assertEqual(BorrowedBook.objects.filter(is_overdue=True).get(), lent[0])
+
+    def test_rollover_flags_loans_past_their_return_date(self):
+        loan = BorrowedBook.objects.create(member=self.member, book=self.book, return_date=self.today, fine=5)
+        self.assertEqual(self.overdue_titles(), [])
+
+        accrue_fines(self.today + datetime.timedelta(days=1))
+
+        loan.refresh_from_db()
+        self.assertTrue(loan.is_overdue)
+        self.assertEqual(self.overdue_titles(), ["Test Title"])
+
+    def test_dashboard_counts_overdue_flag(self):
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12", fine=5)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2999-12-12", fine=7)
+
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.context["total_overdue_books"], 1)
+        self.assertEqual(response.context["overdue_amount"], 5)
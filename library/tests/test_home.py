@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member, Transaction
+from users.models import Librarian
+
+
+class TestHomeView(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title",
+            author="Test Author",
+            category="fiction",
+            quantity=10,
+            borrowing_fee=1.00,
+            status="available",
+            librarian=self.user,
+        )
+        Book.objects.create(
+            title="Other Title",
+            author="Other Author",
+            category="fiction",
+            quantity=10,
+            borrowing_fee=1.00,
+            librarian=self.other_user,
+        )
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12", fine=5.00)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2999-12-12", fine=7.00)
+        Transaction.objects.create(member=self.member, amount=3.00, payment_method="cash")
+
+    def test_login_required(self):
+        response = self.client.get(reverse("home"))
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('home')}")
+
+    def test_dashboard_stats(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.context["total_members"], 1)
+        self.assertEqual(response.context["total_books"], 1)
+        self.assertEqual(response.context["total_borrowed_books"], 2)
+        self.assertEqual(response.context["total_overdue_books"], 1)
+        self.assertEqual(response.context["total_amount"], 3)
+        self.assertEqual(response.context["overdue_amount"], 5)
+
+    async def test_dashboard_served_asynchronously(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("home"))
+
+        self.assertEqual(response.context["total_books"], 1)
+        self.assertContains(response, "Test Title")
+
+    def test_stats_are_cached_until_data_changes(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("home"))
+
+        # The session, user, stats and recently added books all come from the cache.
+        with self.assertNumQueries(0):
+            self.client.get(reverse("home"))
+
+        Book.objects.create(
+            title="New Title", author="New Author", category="fiction", quantity=1, librarian=self.user
+        )
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.context["total_books"], 2)
@@ -0,0 +1,99 @@
+import io
+import tempfile
+
+import openpyxl
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from library.imports import import_catalog, read_rows
+from library.models import Book, Member
+from users.models import Librarian
+
+
+def csv_upload(content, name="catalog.csv"):
+    return SimpleUploadedFile(name, content.encode("utf-8-sig"), content_type="text/csv")
+
+
+class TestImportCatalog(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+
+    def test_import_books_from_csv(self):
+        upload = csv_upload(
+            "Title,Author,Category,Quantity,Borrowing_fee\n"
+            "Truyện Kiều,Nguyễn Du,poetry,3,2.50\n"
+            "Số đỏ,Vũ Trọng Phụng,fiction,0,1.00\n"
+            ",Missing Title,fiction,1,1.00\n"
+        )
+        response = self.client.post(reverse("import-catalog"), {"kind": "books", "file": upload})
+
+        result = response.context["result"]
+        self.assertEqual(result.created, 2)
+        self.assertEqual([row_number for row_number, _ in result.errors], [4])
+        self.assertEqual(Book.objects.get(title="Số đỏ").status, "not-available")
+        self.assertEqual(Book.objects.filter(librarian=self.user).count(), 2)
+
+    def test_import_members_skips_taken_emails(self):
+        Member.objects.create(name="Existing", email="taken@gmail.com", librarian=self.user)
+        rows = read_rows(
+            io.BytesIO(
+                b"name,email\n"
+                b"Binh,binh@gmail.com\n"
+                b"Taken,taken@gmail.com\n"
+                b"Binh Again,binh@gmail.com\n"
+                b"An,an@gmail.com\n"
+            ),
+            "members.csv",
+        )
+        result = import_catalog(self.user, "members", rows, chunk_size=2)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([row_number for row_number, _ in result.errors], [3, 4])
+        self.assertEqual(Member.objects.filter(email="binh@gmail.com").count(), 1)
+
+    def test_import_checks_emails_once_per_chunk(self):
+        rows = [(i, {"name": f"Member {i}", "email": f"member{i}@gmail.com"}) for i in range(2, 12)]
+
+        # One lookup and one INSERT per chunk, plus the stats invalidation which doesn't touch the database.
+        with self.assertNumQueries(4):
+            result = import_catalog(self.user, "members", iter(rows), chunk_size=5)
+
+        self.assertEqual(result.created, 10)
+
+    def test_import_books_from_xlsx(self):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["title", "author", "category", "quantity", "borrowing_fee"])
+        sheet.append(["Truyện Kiều", "Nguyễn Du", "poetry", 3, 2.5])
+        sheet.append(["Số đỏ", "Vũ Trọng Phụng", "unknown", 1, 1])
+        content = io.BytesIO()
+        workbook.save(content)
+
+        upload = SimpleUploadedFile("catalog.xlsx", content.getvalue())
+        response = self.client.post(reverse("import-catalog"), {"kind": "books", "file": upload})
+
+        result = response.context["result"]
+        self.assertEqual(result.created, 1)
+        self.assertEqual([row_number for row_number, _ in result.errors], [3])
+        self.assertEqual(Book.objects.get(title="Truyện Kiều").quantity, 3)
+
+    def test_rejects_unsupported_file_type(self):
+        upload = SimpleUploadedFile("catalog.txt", b"title\n")
+        response = self.client.post(reverse("import-catalog"), {"kind": "books", "file": upload})
+
+        self.assertNotIn("result", response.context)
+        self.assertTrue(response.context["form"].errors["file"])
+
+    def test_import_catalog_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as file:
+            file.write("name,email\nBinh,binh@gmail.com\nBad,not-an-email\n")
+            file.flush()
+            out, err = io.StringIO(), io.StringIO()
+            call_command("import_catalog", "members", file.name, librarian=self.user.email, stdout=out, stderr=err)
+
+        self.assertIn("Imported 1 members, 1 errors.", out.getvalue())
+        self.assertIn("Row 3: email:", err.getvalue())
+        self.assertEqual(Member.objects.get(email="binh@gmail.com").librarian, self.user)
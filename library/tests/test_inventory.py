@@ -0,0 +1,51 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from library.inventory import checkout, checkout_many, restock, return_loan
+from library.models import Book, BorrowedBook, Member
+from users.models import Librarian
+
+
+class TestInventory(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=1, librarian=self.user
+        )
+
+    def test_checkout_and_restock_return_new_quantity(self):
+        self.assertEqual(checkout(self.book.pk), 0)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.status, "not-available")
+
+        self.assertEqual(restock(self.book.pk), 1)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.status, "available")
+
+    def test_stock_never_goes_negative(self):
+        checkout(self.book.pk)
+
+        self.assertIsNone(checkout(self.book.pk))
+        self.assertEqual(checkout_many([self.book.pk]), 0)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.quantity, 0)
+
+    def test_loan_is_restocked_only_once(self):
+        borrowed_book = BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2999-12-12")
+
+        self.assertEqual(return_loan(borrowed_book), 2)
+        self.assertIsNone(return_loan(borrowed_book))
+
+        borrowed_book.refresh_from_db()
+        self.assertTrue(borrowed_book.returned)
+
+    def test_deleting_returned_loan_does_not_restock(self):
+        borrowed_book = BorrowedBook.objects.create(
+            member=self.member, book=self.book, return_date="2999-12-12", returned=True
+        )
+        self.client.force_login(self.user)
+        self.client.get(reverse("delete-borrowed-book", kwargs={"pk": borrowed_book.pk}))
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.quantity, 1)
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 
-from library.models import Member
+from library.models import Book, BorrowedBook, Member
 from users.models import Librarian
 
 
@@ -37,6 +37,32 @@ class TestAddMemberView(TestCase):
         assert response.context["form"].errors["email"] == ["A member with that email already exists."]
 
 
+class TestMembersListView(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+        for i in range(5):
+            member = Member.objects.create(name=f"Member {i}", email=f"member{i}@gmail.com", librarian=self.user)
+            BorrowedBook.objects.create(member=member, book=self.book, return_date="2021-12-12", fine=i)
+            BorrowedBook.objects.create(member=member, book=self.book, return_date="2999-12-12", fine=100)
+
+    def test_login_required(self):
+        response = self.client.get(reverse("members"))
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('members')}")
+
+    def test_list_members_query_count_does_not_grow_with_members(self):
+        self.client.force_login(self.user)
+
+        # user and the members list; the session comes from the cache.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("members"))
+
+        self.assertContains(response, "Member 4")
+
+
 class TestUpdateMemberDetailsView(TestCase):
     def setUp(self):
         self.member = Member.objects.create(name="John Doe", email="johndoe@gmail.com")
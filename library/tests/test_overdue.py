@@ -0,0 +1,55 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from library.inventory import return_loan
+from library.models import Book, BorrowedBook, Member
+from users.models import Librarian
+
+
+class TestOverdueBooksView(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+        self.loan = BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12")
+
+        other_member = Member.objects.create(name="Other", email="other-member@gmail.com", librarian=self.other_user)
+        other_book = Book.objects.create(
+            title="Other Title", author="Other Author", category="fiction", quantity=10, librarian=self.other_user
+        )
+        BorrowedBook.objects.create(member=other_member, book=other_book, return_date="2021-12-12")
+        self.client.force_login(self.user)
+
+    def titles(self):
+        response = self.client.get(reverse("overdue-books"))
+        return [loan.book.title for loan in response.context["books"]]
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("overdue-books"))
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('overdue-books')}")
+
+    def test_only_own_overdue_books_are_listed(self):
+        self.assertEqual(self.titles(), ["Test Title"])
+
+    def test_page_is_served_from_cache(self):
+        self.titles()
+
+        # The session and user come from the cache as well.
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("overdue-books"))
+        self.assertContains(response, "Test Title")
+
+    def test_loan_changes_invalidate_cached_page(self):
+        self.titles()
+
+        self.book.title = "Renamed"
+        self.book.save()
+        self.assertEqual(self.titles(), ["Renamed"])
+
+        return_loan(self.loan)
+        self.assertEqual(self.titles(), [])
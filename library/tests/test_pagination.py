@@ -0,0 +1,68 @@
+import base64
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from library.models import Book
+from users.models import Librarian
+
+
+@override_settings(LIST_PAGE_SIZE=2)
+class TestKeysetPagination(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        for i in range(5):
+            Book.objects.create(
+                title=f"Title {i}", author="Test Author", category="fiction", quantity=1, librarian=self.user
+            )
+        self.client.force_login(self.user)
+
+    def titles(self, response):
+        return [book.title for book in response.context["books"]]
+
+    def test_first_page_is_newest_first(self):
+        response = self.client.get(reverse("books"))
+
+        self.assertEqual(self.titles(response), ["Title 4", "Title 3"])
+        self.assertIsNone(response.context["books"].previous_url)
+
+    def test_walk_forward_and_back(self):
+        page = self.client.get(reverse("books")).context["books"]
+        seen = []
+        while True:
+            seen.extend(book.title for book in page)
+            if not page.next_url:
+                break
+            page = self.client.get(reverse("books") + page.next_url).context["books"]
+
+        self.assertEqual(seen, ["Title 4", "Title 3", "Title 2", "Title 1", "Title 0"])
+
+        page = self.client.get(reverse("books") + page.previous_url).context["books"]
+        self.assertEqual([book.title for book in page], ["Title 2", "Title 1"])
+
+    def test_page_size_parameter(self):
+        response = self.client.get(reverse("books"), {"page_size": 4})
+
+        self.assertEqual(len(response.context["books"]), 4)
+        self.assertIn("page_size=4", response.context["books"].next_url)
+
+    def test_search_query_is_kept_in_page_links(self):
+        response = self.client.post(reverse("books") + "?page_size=1", {"query": "Title"})
+
+        self.assertIn("query=Title", response.context["books"].next_url)
+
+    def test_invalid_cursor_serves_first_page(self):
+        response = self.client.get(reverse("books"), {"after": "not-a-cursor"})
+
+        self.assertEqual(self.titles(response), ["Title 4", "Title 3"])
+
+    def test_tampered_cursor_serves_first_page(self):
+        for values in (["x", "y"], [["x"], {"y": 1}], [None, None]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+            response = self.client.get(reverse("books"), {"after": cursor})
+            self.assertEqual(self.titles(response), ["Title 4", "Title 3"])
+
+            response = self.client.get(reverse("v1:books"), {"before": cursor})
+            self.assertEqual(response.status_code, 200)
@@ -0,0 +1,74 @@
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.middleware import QueryStatsMiddleware
+from core.querystats import install_query_stats
+from library.models import Book, BorrowedBook, Member
+from library.tests.test_export import read_stream
+from users.models import Librarian
+
+
+class TestQueryStatsMiddleware(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2999-12-12")
+        self.client.force_login(self.user)
+
+    def test_queries_are_logged_with_view(self):
+        with self.assertLogs("core.middleware", "INFO") as logs, CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("lent-books"))
+
+        record = logs.records[-1]
+        self.assertEqual(record.view, "library.views.LentBooksListView")
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.db_queries, len(queries))
+        self.assertGreater(record.db_time_ms, 0)
+        self.assertNotIn("n_plus_one", record.__dict__)
+
+    def test_streamed_queries_are_logged_once_sent(self):
+        with self.assertLogs("core.middleware", "INFO") as logs:
+            response = self.client.get(reverse("export-lent-books"))
+            self.assertEqual(logs.output, [])
+            list(response.streaming_content)
+            response.close()
+
+        self.assertEqual(logs.records[-1].view, "library.views.ExportLentBooksView")
+        self.assertGreater(logs.records[-1].db_queries, 0)
+
+    async def test_async_streamed_queries_are_logged_once_sent(self):
+        # The async client loads the middleware in another thread, which doesn't see the test's open connection.
+        await sync_to_async(install_query_stats)(connection)
+        await self.async_client.aforce_login(self.user)
+
+        with self.assertLogs("core.middleware", "INFO") as logs:
+            response = await self.async_client.get(reverse("export-lent-books"))
+            self.assertEqual(logs.output, [])
+            await read_stream(response)
+
+        self.assertEqual(logs.records[-1].view, "library.views.ExportLentBooksView")
+        self.assertGreater(logs.records[-1].db_queries, 0)
+
+    @override_settings(N_PLUS_ONE_THRESHOLD=3)
+    def test_repeated_statements_are_flagged(self):
+        def view(request):
+            for member in Member.objects.all():
+                for _ in range(3):
+                    list(member.borrowed_books.all())
+            return HttpResponse()
+
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            QueryStatsMiddleware(view)(RequestFactory().get("/"))
+
+        record = logs.records[-1]
+        self.assertEqual(record.db_queries, 4)
+        self.assertEqual(record.db_duplicates, 2)
+        self.assertEqual(record.n_plus_one[0]["count"], 3)
+        self.assertIn("library_borrowedbook", record.n_plus_one[0]["sql"])
@@ -0,0 +1,93 @@
+from django.db import router
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.routers import get_request_state, start_request
+from library import fines
+from library.fines import ensure_fines_accrued
+from library.models import Book, Member
+from users.models import Librarian
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"])
+class TestReplicaRouter(TestCase):
+    def test_reads_go_to_replicas_only_when_enabled(self):
+        state = start_request()
+        self.assertEqual(router.db_for_read(Book), "default")
+
+        state.replica_reads = True
+        self.assertIn(router.db_for_read(Book), ["replica1", "replica2"])
+
+    def test_writes_go_to_primary(self):
+        state = start_request()
+        state.replica_reads = True
+        book = Book(title="Test Title", author="Test Author", category="fiction")
+        book._state.db = "replica1"
+        member = Member(name="John Doe")
+        member._state.db = "default"
+
+        self.assertEqual(router.db_for_write(Book, instance=book), "default")
+        self.assertTrue(state.wrote)
+        self.assertTrue(router.allow_relation(book, member))
+
+    def test_reads_after_a_write_go_to_primary(self):
+        state = start_request()
+        state.replica_reads = True
+
+        router.db_for_write(Book)
+
+        self.assertEqual(router.db_for_read(Book), "default")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(router.allow_migrate("replica1", "library"))
+        self.assertTrue(router.allow_migrate("default", "library"))
+
+
+# The replicas are the primary itself here, as the test database has no replica alias.
+@override_settings(DATABASE_REPLICAS=["default"], REPLICA_PIN_SECONDS=60)
+class TestReplicaMiddleware(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+        self.client.force_login(self.user)
+        # The day's fine accrual is a write as well.
+        ensure_fines_accrued()
+
+    def reads_from_replicas(self, url_name):
+        self.client.get(reverse(url_name))
+        return get_request_state().replica_reads
+
+    def test_list_and_report_views_read_from_replicas(self):
+        self.assertTrue(self.reads_from_replicas("lent-books"))
+        self.assertTrue(self.reads_from_replicas("home"))
+        self.assertTrue(self.reads_from_replicas("export-members"))
+        self.assertFalse(self.reads_from_replicas("add-member"))
+
+    def test_writes_pin_librarian_to_primary(self):
+        self.client.post(
+            reverse("lend-book"),
+            {
+                "book": self.book.pk,
+                "member": self.member.pk,
+                "return_date": "2999-12-12",
+                "fine": 0,
+                "payment_method": "cash",
+            },
+        )
+
+        self.assertTrue(get_request_state().wrote)
+        self.assertFalse(self.reads_from_replicas("lent-books"))
+
+        # Other librarians still read from the replicas.
+        self.client.force_login(Librarian.objects.create_user(email="other@gmail.com", password="password"))
+        self.assertTrue(self.reads_from_replicas("lent-books"))
+
+    def test_view_reads_its_own_writes_from_primary(self):
+        # The first request of the day accrues the fines before reading the list.
+        fines._accrued_through.clear()
+
+        self.assertFalse(self.reads_from_replicas("lent-books"))
+        self.assertTrue(get_request_state().wrote)
@@ -0,0 +1,66 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member
+from users.models import Librarian
+
+
+class TestSearch(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.other_user = Librarian.objects.create_user(email="other@gmail.com", password="password")
+        self.book = Book.objects.create(
+            title="Truyện Kiều", author="Nguyễn Du", category="poetry", quantity=10, librarian=self.user
+        )
+        Book.objects.create(
+            title="Số đỏ", author="Vũ Trọng Phụng", category="fiction", quantity=10, librarian=self.user
+        )
+        Book.objects.create(
+            title="Truyện Kiều", author="Nguyễn Du", category="poetry", quantity=10, librarian=self.other_user
+        )
+        self.member = Member.objects.create(name="Trần Thị Bình", email="binh@gmail.com", librarian=self.user)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12")
+        self.client.force_login(self.user)
+
+    def titles(self, response):
+        return [book.title for book in response.context["books"]]
+
+    def test_search_ignores_diacritics(self):
+        response = self.client.post(reverse("books"), {"query": "truyen kieu"})
+
+        self.assertEqual(self.titles(response), ["Truyện Kiều"])
+
+    def test_search_matches_author(self):
+        response = self.client.post(reverse("books"), {"query": "Vũ Trọng Phụng"})
+
+        self.assertEqual(self.titles(response), ["Số đỏ"])
+
+    def test_search_tolerates_typos(self):
+        response = self.client.post(reverse("books"), {"query": "Truyen Kieeu"})
+
+        self.assertEqual(self.titles(response), ["Truyện Kiều"])
+
+    def test_search_members(self):
+        response = self.client.post(reverse("members"), {"query": "binh"})
+
+        self.assertEqual([member.name for member in response.context["members"]], ["Trần Thị Bình"])
+
+    def test_search_lent_books(self):
+        response = self.client.post(reverse("lent-books"), {"query": "kieu"})
+
+        self.assertEqual([loan.book.title for loan in response.context["books"]], ["Truyện Kiều"])
+
+    @override_settings(LIST_PAGE_SIZE=1)
+    def test_search_results_are_ranked_and_paged(self):
+        Book.objects.create(
+            title="Kiều", author="Unknown", category="poetry", quantity=1, librarian=self.user
+        )
+        page = self.client.get(reverse("books"), {"query": "kieu"}).context["books"]
+        self.assertEqual(page.ordering[0], "rank")
+
+        seen = [book.title for book in page]
+        while page.next_url:
+            page = self.client.get(reverse("books") + page.next_url).context["books"]
+            seen.extend(book.title for book in page)
+
+        self.assertEqual(sorted(seen), ["Kiều", "Truyện Kiều"])
@@ -1,5 +1,6 @@
-from django.urls import path
+from django.urls import path, register_converter
 
+from .converters import PrimaryKeyConverter
 from .views import (
     AddBookView,
     AddMemberView,
@@ -8,7 +9,12 @@ from .views import (
     DeleteBorrowedBookView,
     DeleteMemberView,
     DeletePaymentView,
+    ExportLentBooksView,
+    ExportMembersView,
+    ExportOverdueBooksView,
+    ExportPaymentsView,
     HomeView,
+    ImportCatalogView,
     LendBookView,
     LentBooksListView,
     ListPaymentsView,
@@ -21,23 +27,30 @@ from .views import (
     UpdateMemberDetailsView,
 )
 
+register_converter(PrimaryKeyConverter, "pk")
+
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("add-member/", AddMemberView.as_view(), name="add-member"),
     path("members/", MembersListView.as_view(), name="members"),
-    path("edit-member-details/<str:pk>/", UpdateMemberDetailsView.as_view(), name="update-member"),
-    path("delete-member/<str:pk>/", DeleteMemberView.as_view(), name="delete-member"),
+    path("members/export/", ExportMembersView.as_view(), name="export-members"),
+    path("edit-member-details/<pk:pk>/", UpdateMemberDetailsView.as_view(), name="update-member"),
+    path("delete-member/<pk:pk>/", DeleteMemberView.as_view(), name="delete-member"),
     path("add-book/", AddBookView.as_view(), name="add-book"),
     path("books/", BooksListView.as_view(), name="books"),
-    path("edit-book-details/<str:pk>/", UpdateBookDetailsView.as_view(), name="update-book"),
-    path("delete-book/<str:pk>/", DeleteBookView.as_view(), name="delete-book"),
+    path("import/", ImportCatalogView.as_view(), name="import-catalog"),
+    path("edit-book-details/<pk:pk>/", UpdateBookDetailsView.as_view(), name="update-book"),
+    path("delete-book/<pk:pk>/", DeleteBookView.as_view(), name="delete-book"),
     path("lend-book/", LendBookView.as_view(), name="lend-book"),
     path("lent-books/", LentBooksListView.as_view(), name="lent-books"),
-    path("edit-borrowed-book/<str:pk>/", UpdateBorrowedBookView.as_view(), name="edit-borrowed-book"),
-    path("delete-borrowed-book/<str:pk>/", DeleteBorrowedBookView.as_view(), name="delete-borrowed-book"),
-    path("return-book/<str:pk>/", ReturnBookView.as_view(), name="return-book"),
-    path("return-book-fine/<str:pk>/", ReturnBookFineView.as_view(), name="return-book-fine"),
+    path("lent-books/export/", ExportLentBooksView.as_view(), name="export-lent-books"),
+    path("edit-borrowed-book/<pk:pk>/", UpdateBorrowedBookView.as_view(), name="edit-borrowed-book"),
+    path("delete-borrowed-book/<pk:pk>/", DeleteBorrowedBookView.as_view(), name="delete-borrowed-book"),
+    path("return-book/<pk:pk>/", ReturnBookView.as_view(), name="return-book"),
+    path("return-book-fine/<pk:pk>/", ReturnBookFineView.as_view(), name="return-book-fine"),
     path("payments/", ListPaymentsView.as_view(), name="payments"),
-    path("delete-payment/<str:pk>/", DeletePaymentView.as_view(), name="delete-payment"),
+    path("payments/export/", ExportPaymentsView.as_view(), name="export-payments"),
+    path("delete-payment/<pk:pk>/", DeletePaymentView.as_view(), name="delete-payment"),
     path("overdue-books/", OverdueBooksView.as_view(), name="overdue-books"),
+    path("overdue-books/export/", ExportOverdueBooksView.as_view(), name="export-overdue-books"),
 ]
@@ -1,65 +1,74 @@
 import logging
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.db import transaction
 from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 from django.views.generic import View
 
+from .cache import aget_librarian_version, params_digest
+from .exports import csv_response
+from .decorators import alogin_required
+from .fines import BORROWING_LIMIT, aensure_fines_accrued, ensure_fines_accrued, update_loan
 from .forms import (
     AddBookForm,
     AddMemberForm,
+    ImportCatalogForm,
     LendBookForm,
     LendMemberBookForm,
     PaymentForm,
     UpdateBorrowedBookForm,
     UpdateMemberForm,
 )
+from .imports import ImportFormatError, import_catalog, read_rows
+from .inventory import delete_loan, return_loan
+from .lending import BookUnavailableError, lend_books
+from .mixins import LibrarianQuerysetMixin
 from .models import Book, BorrowedBook, Member, Transaction
+from .pagination import paginate
+from .search import search_books, search_borrowed_books, search_members, search_payments
+from .stats import aget_dashboard_stats
 
 logger = logging.getLogger(__name__)
 
+LIST_PAGE_KEY = "library:list:{name}:{librarian_id}:{date}:{version}:{params}"
 
-@method_decorator(login_required, name="dispatch")
+
+@method_decorator(alogin_required, name="dispatch")
 class HomeView(View):
     """
     Home view for the library management system. Displays the Dashboard.
     Only data belonging to the logged-in Librarian is shown.
     """
 
-    def get(self, request, *args, **kwargs):
+    replica_reads = True
+
+    async def get(self, request, *args, **kwargs):
         # Lọc dữ liệu theo librarian hiện tại
         librarian = request.user
 
-        members = Member.objects.filter(librarian=librarian)
-        books = Book.objects.filter(librarian=librarian)
-        borrowed_books = BorrowedBook.objects.filter(book__librarian=librarian, returned=False)
-        overdue_books = BorrowedBook.objects.filter(
-            book__librarian=librarian, return_date__lt=timezone.now().date(), returned=False
-        )
-
-        total_members = members.count()
-        total_books = books.count()
-        total_borrowed_books = borrowed_books.count()
-        total_overdue_books = overdue_books.count()
-
-        recently_added_books = books.order_by("-created_at")[:4]
-
-        total_amount = sum([payment.amount for payment in Transaction.objects.filter(member__librarian=librarian)])
-        overdue_amount = sum([book.fine for book in overdue_books])
+        stats = await aget_dashboard_stats(librarian.pk)
+        # Only evaluated when the cached fragment of the template has expired.
+        recently_added_books = Book.objects.filter(librarian=librarian).order_by("-created_at")[:4]
 
         context = {
-            "total_members": total_members,
-            "total_books": total_books,
-            "total_borrowed_books": total_borrowed_books,
-            "total_overdue_books": total_overdue_books,
+            "total_members": stats["total_members"],
+            "total_books": stats["total_books"],
+            "total_borrowed_books": stats["total_borrowed_books"],
+            "total_overdue_books": stats["total_overdue_books"],
             "recently_added_books": recently_added_books,
-            "total_amount": total_amount,
-            "overdue_amount": overdue_amount,
+            "total_amount": stats["total_amount"],
+            "overdue_amount": stats["overdue_amount"],
+            "version": await aget_librarian_version(librarian.pk),
+            "list_cache_timeout": settings.LIST_CACHE_TIMEOUT,
         }
 
-        return render(request, "index.html", context)
+        # Rendered in a thread, where the template can still run the recently added books query.
+        return await sync_to_async(render)(request, "index.html", context)
 
 
 
@@ -90,24 +99,64 @@ class AddMemberView(View):
 
 
 
-@method_decorator(login_required, name="dispatch")
-class MembersListView(View):
+class CachedListView(LibrarianQuerysetMixin, View):
+    """
+    Base view for the list pages of the logged-in Librarian's data.
+    get(): Returns a page of the list.
+    post(): Returns a page of the list based on the search query.
+    The rendered table of each page is cached per librarian, see get_page_key(). The views are async, so under
+    ASGI a worker keeps serving other requests while one waits on the database. They read from the replicas, if any.
+    """
+
+    replica_reads = True
+    template_name = None
+    context_object_name = None
+
+    async def get(self, request, *args, **kwargs):
+        return await self.render_page(request, request.GET.get("query"))
+
+    async def post(self, request, *args, **kwargs):
+        return await self.render_page(request, request.POST.get("query"))
+
+    async def render_page(self, request, query=None):
+        # Only paginated when the cached fragment of the template is missing, in the thread rendering it.
+        page = SimpleLazyObject(lambda: paginate(request, self.get_queryset(request, query), query))
+        context = {
+            self.context_object_name: page,
+            "query": query,
+            "page_key": await self.get_page_key(request, query),
+            "list_cache_timeout": settings.LIST_CACHE_TIMEOUT,
+        }
+        return await sync_to_async(render)(request, self.template_name, context)
+
+    async def get_page_key(self, request, query=None):
+        """
+        Return the cache key of the rendered table and page links of the requested page.
+        The key holds the date and the librarian's data version, so the daily rollover and any change to their books,
+        members, loans or payments move on to a fresh entry.
+        """
+        await aensure_fines_accrued()
+        return LIST_PAGE_KEY.format(
+            name=self.template_name,
+            librarian_id=request.user.pk,
+            date=timezone.now().date(),
+            version=await aget_librarian_version(request.user.pk),
+            params=params_digest({**request.GET.dict(), "query": query or ""}),
+        )
+
+
+@method_decorator(alogin_required, name="dispatch")
+class MembersListView(CachedListView):
     """
     Members List view for the library management system.
     get(): Returns the list of members in the library that belong to the logged-in Librarian.
     post(): Returns the list of members based on the search query for the logged-in Librarian.
     """
 
-    def get(self, request, *args, **kwargs):
-        librarian = request.user
-        members = Member.objects.filter(librarian=librarian)  # Lọc theo librarian hiện tại
-        return render(request, "members/list-members.html", {"members": members})
-
-    def post(self, request, *args, **kwargs):
-        librarian = request.user
-        query = request.POST.get("query")
-        members = Member.objects.filter(librarian=librarian, name__icontains=query)  # Lọc theo librarian hiện tại
-        return render(request, "members/list-members.html", {"members": members})
+    template_name = "members/list-members.html"
+    context_object_name = "members"
+    model = Member
+    search = staticmethod(search_members)
 
 
 
@@ -129,7 +178,8 @@ class UpdateMemberDetailsView(View):
         form = UpdateMemberForm(request.POST, instance=member)
 
         if form.is_valid():
-            form.save()
+            # amount_due is maintained by fine accrual, saving the copy loaded above could undo a concurrent change.
+            form.instance.save(update_fields=["name", "email", "updated_at"])
             logger.info("Member details updated successfully.")
             return redirect("members")
 
@@ -182,17 +232,43 @@ class AddBookView(View):
 
 
 @method_decorator(login_required, name="dispatch")
-class BooksListView(View):
+class ImportCatalogView(View):
+    """
+    Import books or members from a CSV/XLSX file for the logged-in Librarian.
+    Valid rows are added and the rows that failed validation are listed with their errors.
+    """
+
     def get(self, request, *args, **kwargs):
-        books = Book.objects.filter(librarian=request.user)
-        return render(request, "books/list-books.html", {"books": books})
+        form = ImportCatalogForm()
+        return render(request, "import-catalog.html", {"form": form})
 
     def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        books = Book.objects.filter(
-        Q(librarian=request.user) & (Q(title__icontains=query) | Q(author__icontains=query))
-        )
-        return render(request, "books/list-books.html", {"books": books})
+        form = ImportCatalogForm(request.POST, request.FILES)
+
+        if not form.is_valid():
+            logger.error(f"Error occurred while importing catalog: {form.errors}")
+            return render(request, "import-catalog.html", {"form": form})
+
+        upload = form.cleaned_data["file"]
+        kind = form.cleaned_data["kind"]
+        try:
+            result = import_catalog(request.user, kind, read_rows(upload, upload.name))
+        except ImportFormatError as e:
+            logger.error(f"Error occurred while importing catalog: {e}")
+            form.add_error("file", str(e))
+            return render(request, "import-catalog.html", {"form": form})
+
+        logger.info(f"Librarian {request.user} imported {result.created} {kind}, {len(result.errors)} row errors.")
+        return render(request, "import-catalog.html", {"form": ImportCatalogForm(), "result": result})
+
+
+
+@method_decorator(alogin_required, name="dispatch")
+class BooksListView(CachedListView):
+    template_name = "books/list-books.html"
+    context_object_name = "books"
+    model = Book
+    search = staticmethod(search_books)
 
 
 @method_decorator(login_required, name="dispatch")
@@ -238,7 +314,7 @@ class LendBookView(View):
     Lend Book view for the library management system.
     get(): Returns the lent book page with the LendBookForm and PaymentForm.
     post(): Validates the form and lends the book to the member.
-            Several Books can be lent to the member at once.
+            Several Books can be lent to the member at once, in a single database transaction.
             if the member has exceeded the borrowing limit, an error message is displayed.
             BorrowedBook and Transaction objects are created and the book quantity is updated.
     """
@@ -249,37 +325,32 @@ class LendBookView(View):
         return render(request, "books/lend-book.html", {"form": form, "payment_form": payment_form})
 
     def post(self, request, *args, **kwargs):
+        # The borrowing limit check reads the member's amount_due, which needs today's fines.
+        ensure_fines_accrued()
         form = LendBookForm(request.POST, user=request.user)
         payment_form = PaymentForm(request.POST)
 
         if form.is_valid() and payment_form.is_valid():
             lent_book = form.save(commit=False)
-            if lent_book.member.amount_due > 500:
+            if lent_book.member.amount_due > BORROWING_LIMIT:
                 form.add_error(None, "Member has exceeded the borrowing limit.")
                 logger.error("Member has exceeded the borrowing limit.")
             else:
-                payment_method = payment_form.cleaned_data["payment_method"]
-                books_ids = request.POST.getlist("book")
-                amount = 0
-                for book_id in books_ids:
-                    book = Book.objects.get(pk=book_id)
-                    BorrowedBook.objects.create(
+                try:
+                    loans, payment = lend_books(
+                        librarian=request.user,
                         member=lent_book.member,
-                        book=book,
+                        book_ids=[book.pk for book in form.cleaned_data["book"]],
                         return_date=lent_book.return_date,
                         fine=lent_book.fine,
+                        payment_method=payment_form.cleaned_data["payment_method"],
                     )
-                    logger.info("Book lent successfully.")
-
-                    book.quantity -= 1
-                    book.save()
-                    logger.info("Book Quantity updated successfully.")
-
-                    amount += book.borrowing_fee
-
-                Transaction.objects.create(member=lent_book.member, amount=amount, payment_method=payment_method)
-                logger.info("Payment made successfully.")
+                except BookUnavailableError as e:
+                    form.add_error(None, str(e))
+                    logger.error(f"Error occurred while issuing book: {e}")
+                    return render(request, "books/lend-book.html", {"form": form, "payment_form": payment_form})
 
+                logger.info(f"{len(loans)} book(s) lent successfully, payment of {payment.amount} made.")
                 return redirect("lent-books")
 
         logger.error(f"Error occurred while issuing book: {form.errors}")
@@ -347,26 +418,20 @@ class LendBookView(View):
 #         )
 
 
-@method_decorator(login_required, name="dispatch")
-class LentBooksListView(View):
-    def get(self, request, *args, **kwargs):
-        books = BorrowedBook.objects.select_related("member", "book").filter(book__librarian=request.user)
-        return render(request, "books/lent-books.html", {"books": books})
-
-    def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        books = BorrowedBook.objects.select_related("member", "book").filter(
-            Q(book__title__icontains=query) | Q(book__author__icontains=query),
-            book__librarian=request.user
-        )
-        return render(request, "books/lent-books.html", {"books": books})
+@method_decorator(alogin_required, name="dispatch")
+class LentBooksListView(CachedListView):
+    template_name = "books/lent-books.html"
+    context_object_name = "books"
+    model = BorrowedBook
+    select_related = ("member", "book")
+    search = staticmethod(search_borrowed_books)
 
 
 @method_decorator(login_required, name="dispatch")
 class UpdateBorrowedBookView(View):
     def get(self, request, *args, **kwargs):
         book = BorrowedBook.objects.select_related("book").filter(
-            pk=kwargs["pk"], book__librarian=request.user
+            pk=kwargs["pk"], librarian=request.user
         ).first()
         if not book:
             logger.warning("Unauthorized access to borrowed book update.")
@@ -377,7 +442,7 @@ class UpdateBorrowedBookView(View):
 
     def post(self, request, *args, **kwargs):
         book = BorrowedBook.objects.select_related("book").filter(
-            pk=kwargs["pk"], book__librarian=request.user
+            pk=kwargs["pk"], librarian=request.user
         ).first()
         if not book:
             logger.warning("Unauthorized update attempt.")
@@ -385,7 +450,7 @@ class UpdateBorrowedBookView(View):
 
         form = UpdateBorrowedBookForm(request.POST, instance=book)
         if form.is_valid():
-            form.save()
+            update_loan(form.save(commit=False))
             logger.info("Borrowed book details updated successfully.")
             return redirect("lent-books")
 
@@ -404,12 +469,8 @@ class DeleteBorrowedBookView(View):
     def get(self, request, *args, **kwargs):
         borrowed_book = BorrowedBook.objects.get(pk=kwargs["pk"])
 
-        book = borrowed_book.book
-        book.quantity += 1
-        book.save()
-        logger.info("Book Quantity updated successfully.")
-
-        borrowed_book.delete()
+        if delete_loan(borrowed_book) is not None:
+            logger.info("Book Quantity updated successfully.")
 
         logger.info("Borrowed book deleted successfully.")
         return redirect("lent-books")
@@ -430,14 +491,8 @@ class ReturnBookView(View):
             return redirect("return-book-fine", pk=borrowed_book.pk)
 
         else:
-            borrowed_book.returned = True
-            borrowed_book.save()
-            logger.info("Book returned successfully.")
-
-            book = borrowed_book.book
-            book.quantity += 1
-            book.save()
-            logger.info("Book Quantity updated successfully.")
+            if return_loan(borrowed_book) is not None:
+                logger.info("Book returned successfully.")
 
             return redirect("lent-books")
 
@@ -464,15 +519,10 @@ class ReturnBookFineView(View):
             payment_method = form.cleaned_data["payment_method"]
             fine = book.fine
 
-            book.returned = True
-            book.save()
-            logger.info("Book returned successfully.")
-
-            book.book.quantity += 1
-            book.book.save()
-            logger.info("Book Quantity updated successfully.")
-
-            Transaction.objects.create(member=book.member, amount=fine, payment_method=payment_method)
+            with transaction.atomic():
+                if return_loan(book) is not None:
+                    logger.info("Book returned successfully.")
+                    Transaction.objects.create(member=book.member, amount=fine, payment_method=payment_method)
 
             return redirect("lent-books")
         logger.error(f"Error occurred while returning book: {form.errors}")
@@ -480,18 +530,13 @@ class ReturnBookFineView(View):
         return render(request, "books/return-book-fine.html", {"book": book, "form": form})
 
 
-@method_decorator(login_required, name="dispatch")
-class ListPaymentsView(View):
-    def get(self, request, *args, **kwargs):
-        payments = Transaction.objects.select_related("member").filter(member__librarian=request.user)
-        return render(request, "payments/list-payments.html", {"payments": payments})
-
-    def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        payments = Transaction.objects.select_related("member").filter(
-            member__name__icontains=query, member__librarian=request.user
-        )
-        return render(request, "payments/list-payments.html", {"payments": payments})
+@method_decorator(alogin_required, name="dispatch")
+class ListPaymentsView(CachedListView):
+    template_name = "payments/list-payments.html"
+    context_object_name = "payments"
+    model = Transaction
+    select_related = ("member",)
+    search = staticmethod(search_payments)
 
 
 
@@ -509,24 +554,93 @@ class DeletePaymentView(View):
         return redirect("payments")
 
 
-class OverdueBooksView(View):
+@method_decorator(alogin_required, name="dispatch")
+class OverdueBooksView(CachedListView):
     """
     Overdue Books view for the library management system.
-    get(): Returns a list of overdue books.
+    get(): Returns a list of overdue books of the logged-in Librarian.
     post(): Returns a list of overdue books based on the search query.
     """
 
-    def get(self, request, *args, **kwargs):
-        overdue_books = BorrowedBook.objects.filter(
-            return_date__lt=timezone.now().date(), returned=False
-        ).select_related("member", "book")
-        return render(request, "books/overdue-books.html", {"books": overdue_books})
+    template_name = "books/overdue-books.html"
+    context_object_name = "books"
+    model = BorrowedBook
+    filters = {"is_overdue": True}
+    select_related = ("member", "book")
+    search = staticmethod(search_borrowed_books)
 
-    def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        overdue_books = BorrowedBook.objects.filter(
-            Q(book__title__icontains=query) | Q(book__author__icontains=query),
-            return_date__lt=timezone.now().date(),
-            returned=False,
-        ).select_related("member", "book")
-        return render(request, "books/overdue-books.html", {"books": overdue_books})
+
+class CsvExportView(LibrarianQuerysetMixin, View):
+    """
+    Base view streaming a CSV export of the logged-in Librarian's data.
+    The optional ``query`` parameter narrows the export down the same way the search box of the list page does.
+    """
+
+    replica_reads = True
+    filename = None
+    columns = ()  # (header, field lookup) pairs
+
+    async def get(self, request, *args, **kwargs):
+        await aensure_fines_accrued()
+        queryset = self.get_queryset(request, request.GET.get("query"))
+        logger.info(f"Librarian {request.user} exported {self.filename}.")
+        return csv_response(request, self.filename, self.columns, queryset.order_by("-created_at", "-pk"))
+
+
+@method_decorator(alogin_required, name="dispatch")
+class ExportPaymentsView(CsvExportView):
+    filename = "payments.csv"
+    columns = (
+        ("ID", "pk"),
+        ("Thanh toán bởi", "member__name"),
+        ("Email", "member__email"),
+        ("Phương thức thanh toán", "payment_method"),
+        ("Tiền (VNĐ)", "amount"),
+        ("Ngày thanh toán", "created_at"),
+    )
+    model = Transaction
+    search = staticmethod(search_payments)
+
+
+LOAN_EXPORT_COLUMNS = (
+    ("ID", "pk"),
+    ("Tiêu đề sách", "book__title"),
+    ("Tác giả", "book__author"),
+    ("Thành viên", "member__name"),
+    ("Email", "member__email"),
+    ("Ngày mượn", "created_at"),
+    ("Ngày hẹn trả sách", "return_date"),
+    ("Phí phạt", "fine"),
+    ("Đã trả", "returned"),
+)
+
+
+@method_decorator(alogin_required, name="dispatch")
+class ExportLentBooksView(CsvExportView):
+    filename = "lent-books.csv"
+    columns = LOAN_EXPORT_COLUMNS
+    model = BorrowedBook
+    search = staticmethod(search_borrowed_books)
+
+
+@method_decorator(alogin_required, name="dispatch")
+class ExportOverdueBooksView(CsvExportView):
+    filename = "overdue-books.csv"
+    columns = LOAN_EXPORT_COLUMNS
+    model = BorrowedBook
+    filters = {"is_overdue": True}
+    search = staticmethod(search_borrowed_books)
+
+
+@method_decorator(alogin_required, name="dispatch")
+class ExportMembersView(CsvExportView):
+    filename = "members.csv"
+    columns = (
+        ("ID", "pk"),
+        ("Tên", "name"),
+        ("Email", "email"),
+        ("Nợ phạt", "amount_due"),
+        ("Ngày tham gia", "created_at"),
+    )
+    model = Member
+    search = staticmethod(search_members)
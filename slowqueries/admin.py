@@ -0,0 +1,36 @@
+from django.contrib import admin
+from django.utils.html import format_html
+
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Browse the slow-query log, slowest first. Its rows are only written by the recorder, they can be deleted once
+    looked into.
+    """
+
+    list_display = ["duration_ms", "view", "call_site", "database", "analyzed", "created_at"]
+    list_filter = ["analyzed", "database", "view"]
+    search_fields = ["sql", "view", "call_site"]
+    date_hierarchy = "created_at"
+    ordering = ["-duration_ms"]
+    fields = ["created_at", "duration_ms", "view", "call_site", "database", "statement", "query_plan"]
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="SQL")
+    def statement(self, obj):
+        return format_html("<pre>{}</pre>", obj.sql)
+
+    @admin.display(description="Plan")
+    def query_plan(self, obj):
+        if not obj.plan:
+            return "Not sampled for an EXPLAIN."
+        return format_html("<pre>{}</pre>", obj.plan)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SlowQueriesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "slowqueries"
+
+    def ready(self):
+        from . import signals
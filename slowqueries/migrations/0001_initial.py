@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:49
+
+import users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.UUIDField(default=users.models.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sql', models.TextField()),
+                ('duration_ms', models.FloatField()),
+                ('view', models.CharField(blank=True, max_length=255)),
+                ('call_site', models.CharField(blank=True, max_length=255)),
+                ('database', models.CharField(max_length=100)),
+                ('plan', models.TextField(blank=True)),
+                ('analyzed', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import models
+
+from users.models import AbstractBaseModel
+
+
+class SlowQuery(AbstractBaseModel):
+    """
+    A statement that took SLOW_QUERY_THRESHOLD_MS or more, with the view and the line of the project that ran it, and
+    its plan if it was sampled for an EXPLAIN, see slowqueries.recorder.
+    """
+
+    sql = models.TextField()
+    duration_ms = models.FloatField()
+    view = models.CharField(max_length=255, blank=True)
+    call_site = models.CharField(max_length=255, blank=True)
+    database = models.CharField(max_length=100)
+    plan = models.TextField(blank=True)
+    # Whether the plan comes from EXPLAIN ANALYZE, with actual timings and buffers, or is only the estimated one.
+    analyzed = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return f"{self.duration_ms} ms in {self.view or self.call_site or self.database}"
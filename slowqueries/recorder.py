@@ -0,0 +1,164 @@
+"""
+Slow-query log: the statements that take SLOW_QUERY_THRESHOLD_MS or more are saved as SlowQuery rows, with the view
+that ran them and the line of the project's code they came from, and a SLOW_QUERY_EXPLAIN_RATE sample of them with
+their plan as well. Browsable in the admin.
+The EXPLAINs and the inserts are done by a background thread on its own connections, so the request that ran the
+slow statement doesn't wait for them.
+"""
+
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from core import querystats
+from tenants.schema import get_current_schema, tenant_schema
+
+from .models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = str(settings.BASE_DIR) + os.sep
+
+# Frames skipped when looking for the call site: the execute wrappers themselves.
+WRAPPER_FILES = (__file__, querystats.__file__)
+
+# The row-locking clauses of a SELECT, see explain_query().
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(UPDATE|NO\s+KEY\s+UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+
+# Slow statements waiting for the background thread. Dropped when it can't keep up rather than piling up in memory.
+_pending = queue.Queue(maxsize=100)
+
+# Set in the background thread, whose own queries, the EXPLAINs above all, aren't recorded.
+_recording = ContextVar("slow_query_recording", default=False)
+
+
+def install_slow_query_log(connection):
+    """
+    Time the statements of the connection and record the slow ones. Run for every connection as it's opened when
+    SLOW_QUERY_LOG is on.
+    """
+    if _record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_slow_query)
+
+
+def _record_slow_query(execute, sql, params, many, context):
+    if _recording.get():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+            _enqueue(sql, params, many, context["connection"].alias, duration_ms)
+
+
+def _enqueue(sql, params, many, alias, duration_ms):
+    stats = querystats.get_request_stats()
+    query = SlowQuery(
+        sql=sql,
+        duration_ms=round(duration_ms, 1),
+        view=(stats and stats.view) or "",
+        call_site=get_call_site()[:255],
+        database=alias,
+    )
+    # executemany() statements are the bulk writes, there's no single statement to explain.
+    explain = not many and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE
+    try:
+        _pending.put_nowait((query, params if explain else None, get_current_schema(), explain))
+    except queue.Full:
+        logger.warning(f"Slow-query log full, dropped a {query.duration_ms} ms statement of {query.view}.")
+        return
+    _start_thread()
+
+
+def get_call_site():
+    """
+    The innermost line of the project's own code in the stack, e.g. "library/views.py:120 in get_queryset", that is
+    where the queryset was evaluated. Empty for the queries the async ORM runs in an executor thread, whose stack
+    starts at the ORM.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        in_project = filename.startswith(PROJECT_DIR) and "site-packages" not in filename
+        if in_project and not filename.startswith(WRAPPER_FILES):
+            return f"{os.path.relpath(filename, PROJECT_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return ""
+
+
+def explain_query(alias, sql, params):
+    """
+    The plan of the statement, and whether it comes from EXPLAIN ANALYZE.
+    SELECTs get EXPLAIN (ANALYZE, BUFFERS), which runs them again for their actual row counts, timings and buffer
+    use, in a transaction that's rolled back and with SLOW_QUERY_EXPLAIN_TIMEOUT_MS as statement timeout. Other
+    statements, which ANALYZE would really run a second time, only get their estimated plan, and so do the SELECTs
+    locking their rows, e.g. the select_for_update() of lends and returns, which the rows would stay locked for.
+    """
+    analyze = sql.lstrip()[:6].upper() == "SELECT" and not LOCKING_CLAUSE.search(sql)
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}")
+            cursor.execute(f"EXPLAIN {'(ANALYZE, BUFFERS) ' if analyze else ''}{sql}", params)
+            plan = "\n".join(line for line, in cursor.fetchall())
+        transaction.set_rollback(True, using=alias)
+    return plan, analyze
+
+
+def record(query, params, schema_name, explain):
+    with tenant_schema(schema_name):
+        if explain:
+            try:
+                query.plan, query.analyzed = explain_query(query.database, query.sql, params)
+            except Exception:
+                logger.exception(f"Couldn't explain a slow statement of {query.view or query.call_site}.")
+        query.save()
+
+
+def _run_recorder():
+    _recording.set(True)
+    while True:
+        entry = _pending.get()
+        try:
+            record(*entry)
+        except Exception:
+            logger.exception("Couldn't record a slow query.")
+        finally:
+            if _pending.empty():
+                # Don't hold connections open between the bursts of slow statements.
+                connections.close_all()
+            _pending.task_done()
+
+
+def wait_for_pending():
+    """
+    Block until the slow statements recorded so far are saved.
+    """
+    _pending.join()
+
+
+_recorder_pid = None
+_recorder_lock = threading.Lock()
+
+
+def _start_thread():
+    global _recorder_pid
+    if _recorder_pid == os.getpid():
+        return
+    with _recorder_lock:
+        if _recorder_pid == os.getpid():
+            return
+        _recorder_pid = os.getpid()
+
+    thread = threading.Thread(target=_run_recorder, name="slow-query-log", daemon=True)
+    thread.start()
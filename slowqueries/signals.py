@@ -0,0 +1,11 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from slowqueries.recorder import install_slow_query_log
+
+
+@receiver(connection_created)
+def record_slow_queries(sender, connection, **kwargs):
+    if settings.SLOW_QUERY_LOG:
+        install_slow_query_log(connection)
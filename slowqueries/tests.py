@@ -0,0 +1,98 @@
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member
+from slowqueries.models import SlowQuery
+from slowqueries.recorder import install_slow_query_log, wait_for_pending
+from users.models import Librarian
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN_RATE=1)
+class TestSlowQueryLog(TransactionTestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, librarian=self.user
+        )
+        install_slow_query_log(connection)
+        self.addCleanup(connection.execute_wrappers.pop, 0)
+
+    def recorded(self, table):
+        wait_for_pending()
+        return SlowQuery.objects.filter(sql__contains=table)
+
+    def test_selects_are_explained_with_their_call_site(self):
+        list(Book.objects.filter(title="Test Title"))
+
+        query = self.recorded('"library_book"').get()
+        self.assertTrue(query.analyzed)
+        self.assertIn("actual time", query.plan)
+        self.assertTrue(query.call_site.startswith("slowqueries/tests.py:"), query.call_site)
+        self.assertTrue(query.call_site.endswith("in test_selects_are_explained_with_their_call_site"))
+        self.assertEqual(query.database, "default")
+
+    def test_writes_only_get_their_estimated_plan(self):
+        Book.objects.filter(pk=self.book.pk).update(quantity=1)
+
+        query = self.recorded('UPDATE "library_book"').get()
+        self.assertFalse(query.analyzed)
+        self.assertIn("Update on library_book", query.plan)
+        self.assertNotIn("actual time", query.plan)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).quantity, 1)
+
+    def test_locking_selects_only_get_their_estimated_plan(self):
+        with transaction.atomic():
+            list(Book.objects.select_for_update().filter(pk=self.book.pk))
+
+        query = self.recorded("FOR UPDATE").get()
+        self.assertFalse(query.analyzed)
+        self.assertIn("LockRows", query.plan)
+        self.assertNotIn("actual time", query.plan)
+
+    @override_settings(SLOW_QUERY_EXPLAIN_RATE=0)
+    def test_queries_of_views_are_recorded_with_the_view(self):
+        member = Member.objects.create(name="John Doe", email="member@gmail.com", librarian=self.user)
+        BorrowedBook.objects.create(member=member, book=self.book, return_date="2999-12-12")
+        self.client.force_login(self.user)
+
+        self.client.get(reverse("lent-books"))
+
+        queries = self.recorded('"library_borrowedbook"').filter(view="library.views.LentBooksListView")
+        self.assertTrue(queries.exists())
+        self.assertFalse(queries.exclude(plan="").exists())
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60_000)
+    def test_fast_queries_are_not_recorded(self):
+        list(Book.objects.all())
+
+        self.assertFalse(self.recorded('"library_book"').exists())
+
+
+class TestSlowQueryAdmin(TestCase):
+    def setUp(self):
+        self.query = SlowQuery.objects.create(
+            sql='SELECT * FROM "library_book"',
+            duration_ms=812.5,
+            view="library.views.BooksListView",
+            call_site="library/views.py:120 in get_queryset",
+            database="default",
+            plan="Seq Scan on library_book  (actual time=0.01..800.2 rows=90000 loops=1)",
+            analyzed=True,
+        )
+
+    def test_staff_only(self):
+        self.client.force_login(Librarian.objects.create_user(email="test@gmail.com", password="password"))
+
+        response = self.client.get(reverse("admin:slowqueries_slowquery_changelist"))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_plans_are_browsable(self):
+        self.client.force_login(Librarian.objects.create_superuser(email="admin@gmail.com", password="password"))
+
+        response = self.client.get(reverse("admin:slowqueries_slowquery_changelist"))
+        self.assertContains(response, "library/views.py:120 in get_queryset")
+
+        response = self.client.get(reverse("admin:slowqueries_slowquery_change", args=[self.query.pk]))
+        self.assertContains(response, "Seq Scan on library_book")
@@ -0,0 +1,12 @@
+from .schema import get_current_schema
+
+
+def make_key(key, key_prefix, version):
+    """
+    Cache key function that keeps the entries of each tenant apart, so sessions, users and cached pages are never
+    shared between schemas. Keys of the public schema are Django's default ones.
+    """
+    schema_name = get_current_schema()
+    if schema_name is None:
+        return f"{key_prefix}:{version}:{key}"
+    return f"{key_prefix}:{version}:{schema_name}:{key}"
@@ -0,0 +1,24 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from tenants.schema import create_tenant
+
+
+class Command(BaseCommand):
+    help = "Register a tenant and create its schema as a copy of the tables of the public schema."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name")
+        parser.add_argument("domain", help="Host name the tenant is served on.")
+        parser.add_argument("schema_name", help="PostgreSQL schema that holds the tenant's data.")
+        parser.add_argument("--template", default="public", help="Schema whose tables are copied.")
+
+    def handle(self, *args, **options):
+        try:
+            tenant = create_tenant(options["name"], options["domain"], options["schema_name"], options["template"])
+        except ValidationError as e:
+            raise CommandError("; ".join(e.messages))
+        except DatabaseError as e:
+            raise CommandError(f"Could not create schema {options['schema_name']}: {e}")
+        self.stdout.write(self.style.SUCCESS(f"Created tenant {tenant} in schema {tenant.schema_name}."))
@@ -0,0 +1,22 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from tenants.models import Tenant
+from tenants.schema import tenant_schema
+
+
+class Command(BaseCommand):
+    help = "Apply the migrations to the schema of every tenant. Run after migrate, which only migrates public."
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema_names", nargs="*", help="Only migrate these schemas.")
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.order_by("schema_name")
+        if options["schema_names"]:
+            tenants = tenants.filter(schema_name__in=options["schema_names"])
+
+        for tenant in tenants:
+            self.stdout.write(f"Migrating {tenant.schema_name}")
+            with tenant_schema(tenant.schema_name):
+                call_command("migrate", interactive=False, verbosity=options["verbosity"], stdout=self.stdout)
@@ -0,0 +1,33 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .routing import aget_tenant_for_host, get_tenant_for_host
+from .schema import activate
+
+
+class TenantMiddleware:
+    """
+    Route each request to the schema of the tenant served on its host, or to the public schema for any other host.
+    Goes before every middleware that reads the database, like the sessions, which are kept per tenant as well.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.route(request, get_tenant_for_host(request.get_host()))
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.route(request, await aget_tenant_for_host(request.get_host()))
+        return await self.get_response(request)
+
+    def route(self, request, tenant):
+        request.tenant = tenant
+        activate(tenant.schema_name if tenant else None)
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:34
+
+import django.core.validators
+import users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tenant',
+            fields=[
+                ('id', models.UUIDField(default=users.models.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('domain', models.CharField(max_length=253, unique=True)),
+                ('schema_name', models.CharField(max_length=63, unique=True, validators=[django.core.validators.RegexValidator('^(?!pg_|public$|information_schema$)[a-z_][a-z0-9_]*$', 'Use lowercase letters, digits and underscores, not starting with a digit or pg_, and not a reserved schema.')])),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
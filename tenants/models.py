@@ -0,0 +1,23 @@
+from django.core.validators import RegexValidator
+from django.db import models
+
+from users.models import AbstractBaseModel
+
+schema_name_validator = RegexValidator(
+    r"^(?!pg_|public$|information_schema$)[a-z_][a-z0-9_]*$",
+    "Use lowercase letters, digits and underscores, not starting with a digit or pg_, and not a reserved schema.",
+)
+
+
+class Tenant(AbstractBaseModel):
+    """
+    A library with its own PostgreSQL schema, served on its own domain.
+    The tenants themselves are shared: this table only exists in the public schema.
+    """
+
+    name = models.CharField(max_length=255)
+    domain = models.CharField(max_length=253, unique=True)
+    schema_name = models.CharField(max_length=63, unique=True, validators=[schema_name_validator])
+
+    def __str__(self):
+        return self.name
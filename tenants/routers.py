@@ -0,0 +1,13 @@
+from .schema import get_current_schema
+
+
+class TenantRouter:
+    """
+    Keep the tables of the tenants app in the public schema. Migrating a tenant schema records their migrations as
+    applied without running them, as the tenants see the public tables through the search path.
+    """
+
+    def allow_migrate(self, db, app_label, **hints):
+        if app_label == "tenants" and get_current_schema() is not None:
+            return False
+        return None
@@ -0,0 +1,51 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.http.request import split_domain_port
+
+from .models import Tenant
+from .schema import tenant_schema
+
+TENANTS_KEY = "tenants:by-domain"
+
+
+def get_tenants():
+    """
+    Every tenant by domain, from the cache, which holds them until one is saved or deleted.
+    """
+    with tenant_schema(None):
+        tenants = cache.get(TENANTS_KEY)
+        if tenants is None:
+            tenants = {tenant.domain: tenant for tenant in Tenant.objects.all()}
+            cache.set(TENANTS_KEY, tenants, None)
+    return tenants
+
+
+def get_tenant_for_host(host):
+    """
+    The tenant served on the host of a request, or None for the public schema.
+    """
+    domain, _ = split_domain_port(host)
+    return get_tenants().get(domain)
+
+
+def get_schemas():
+    """
+    The public schema, as None, and the schema of every tenant.
+    """
+    return [None] + sorted(tenant.schema_name for tenant in get_tenants().values())
+
+
+async def aget_tenant_for_host(host):
+    return await sync_to_async(get_tenant_for_host)(host)
+
+
+def invalidate_tenants():
+    with tenant_schema(None):
+        cache.delete(TENANTS_KEY)
+    transaction.on_commit(invalidate_tenants_now)
+
+
+def invalidate_tenants_now():
+    with tenant_schema(None):
+        cache.delete(TENANTS_KEY)
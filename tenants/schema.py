@@ -0,0 +1,162 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.migrations.recorder import MigrationRecorder
+
+from .models import Tenant
+
+logger = logging.getLogger(__name__)
+
+# Schema the queries of the current request, thread or task run in, None for the public schema.
+_current_schema = ContextVar("tenant_schema", default=None)
+
+# search_path_schema of a connection whose search path was last set inside a transaction, which a rollback undoes.
+UNKNOWN = object()
+
+# Django's own tables whose rows a new schema starts with, so it has the same migrations, content types and
+# permissions as the template.
+BOOKKEEPING_MODELS = [MigrationRecorder.Migration, ContentType, Permission]
+
+TABLES_SQL = """
+    SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+    ORDER BY c.relname
+"""
+
+# Primary and unique keys come before the foreign keys that reference them.
+CONSTRAINTS_SQL = """
+    SELECT c.relname, con.conname, pg_get_constraintdef(con.oid)
+    FROM pg_constraint con JOIN pg_class c ON c.oid = con.conrelid JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %s AND con.contype IN ('p', 'u', 'x', 'f')
+    ORDER BY con.contype = 'f', c.relname, con.conname
+"""
+
+# The indexes that don't back a constraint, with the table they're on moved to the new schema.
+INDEXES_SQL = """
+    SELECT c.relname, replace(
+        pg_get_indexdef(i.indexrelid),
+        ' ON ' || format('%%I.%%I', n.nspname, c.relname) || ' ',
+        ' ON ' || format('%%I.%%I', %s, c.relname) || ' '
+    )
+    FROM pg_index i JOIN pg_class c ON c.oid = i.indrelid JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %s AND NOT EXISTS (SELECT FROM pg_constraint con WHERE con.conindid = i.indexrelid)
+    ORDER BY c.relname
+"""
+
+
+def get_current_schema():
+    return _current_schema.get()
+
+
+def activate(schema_name):
+    """
+    Run the queries of the current context in the given schema, or in the public schema for None.
+    Nothing is sent to the database here: connections switch their search path before their next query.
+    """
+    _current_schema.set(schema_name)
+
+
+@contextmanager
+def tenant_schema(schema_name):
+    """
+    Run the queries of the block in the given schema, or in the public schema for None.
+    """
+    token = _current_schema.set(schema_name)
+    try:
+        yield
+    finally:
+        _current_schema.reset(token)
+
+
+def install_search_path(connection):
+    """
+    Make a new connection follow the current schema. Run for every connection as it's opened.
+    """
+    connection.search_path_schema = None
+    if _set_search_path not in connection.execute_wrappers:
+        # First, so it also wraps the wrappers added and removed around a block with connection.execute_wrapper().
+        connection.execute_wrappers.insert(0, _set_search_path)
+
+
+def _set_search_path(execute, sql, params, many, context):
+    connection = context["connection"]
+    schema_name = _current_schema.get()
+    if connection.search_path_schema != schema_name:
+        # A cursor of its own, as a server-side cursor can only execute once.
+        with connection.connection.cursor() as cursor:
+            if schema_name is None:
+                cursor.execute("RESET search_path")
+            else:
+                cursor.execute(f"SET search_path TO {connection.ops.quote_name(schema_name)}, public")
+        # Set inside a transaction, the search path is set again before each query until one runs outside of it.
+        connection.search_path_schema = schema_name if connection.get_autocommit() else UNKNOWN
+    return execute(sql, params, many, context)
+
+
+def shared_tables():
+    """
+    Tables that only exist in the public schema and are seen by every tenant through the search path.
+    """
+    return {model._meta.db_table for model in apps.get_app_config("tenants").get_models()}
+
+
+def clone_schema(schema_name, template="public"):
+    """
+    Create a schema with the tables of the template schema, empty except for Django's migrations, content types and
+    permissions, so it's ready to use without running the migrations again.
+    Indexes and keys keep the names they have in the template, so later migrations find them in every schema.
+    Extensions and text search configurations stay in the public schema, which is on the search path of every tenant.
+    """
+    quote = connection.ops.quote_name
+    schema, source = quote(schema_name), quote(template)
+    shared = shared_tables()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Read with the template on the search path, so the definitions refer to its tables without naming it.
+        with tenant_schema(None if template == "public" else template):
+            cursor.execute(TABLES_SQL, [template])
+            tables = [table for table, in cursor.fetchall() if table not in shared]
+            cursor.execute(CONSTRAINTS_SQL, [template])
+            constraints = [row for row in cursor.fetchall() if row[0] not in shared]
+            cursor.execute(INDEXES_SQL, [schema_name, template])
+            indexes = [row for row in cursor.fetchall() if row[0] not in shared]
+
+        cursor.execute(f"CREATE SCHEMA {schema}")
+        with tenant_schema(schema_name):
+            for table in tables:
+                cursor.execute(
+                    f"CREATE TABLE {schema}.{quote(table)} (LIKE {source}.{quote(table)} INCLUDING DEFAULTS "
+                    "INCLUDING IDENTITY INCLUDING GENERATED INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS)"
+                )
+            for table, name, definition in constraints:
+                cursor.execute(f"ALTER TABLE {schema}.{quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+            for _, definition in indexes:
+                cursor.execute(definition)
+
+            for model in BOOKKEEPING_MODELS:
+                table = quote(model._meta.db_table)
+                cursor.execute(
+                    f"INSERT INTO {schema}.{table} OVERRIDING SYSTEM VALUE SELECT * FROM {source}.{table}"
+                )
+            for sql in connection.ops.sequence_reset_sql(no_style(), BOOKKEEPING_MODELS):
+                cursor.execute(sql)
+
+    logger.info(f"Created schema {schema_name} from {template}, {len(tables)} tables.")
+
+
+def create_tenant(name, domain, schema_name, template="public"):
+    """
+    Register a tenant and create its schema from the template, both or neither.
+    """
+    tenant = Tenant(name=name, domain=domain, schema_name=schema_name)
+    tenant.full_clean()
+    with transaction.atomic(), tenant_schema(None):
+        tenant.save()
+        clone_schema(schema_name, template)
+    return tenant
@@ -0,0 +1,17 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tenants.models import Tenant
+from tenants.routing import invalidate_tenants
+from tenants.schema import install_search_path
+
+
+@receiver([post_save, post_delete], sender=Tenant)
+def invalidate_tenants_on_change(sender, **kwargs):
+    invalidate_tenants()
+
+
+@receiver(connection_created)
+def route_new_connection(sender, connection, **kwargs):
+    install_search_path(connection)
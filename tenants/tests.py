@@ -0,0 +1,89 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from library.models import Book
+from tenants.models import Tenant
+from tenants.routing import get_tenant_for_host
+from tenants.schema import create_tenant, tenant_schema
+from users.models import Librarian
+
+
+class TestTenantSchemas(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tenant = create_tenant("Alpha Library", "alpha.example.com", "alpha")
+        self.user = Librarian.objects.create_user(email="public@gmail.com", password="password")
+
+    def table_names(self, schema_name):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = %s", [schema_name])
+            return {table for table, in cursor.fetchall()}
+
+    def test_schema_is_cloned_from_public(self):
+        tables = self.table_names("alpha")
+
+        self.assertIn("library_book", tables)
+        self.assertIn("users_librarian", tables)
+        self.assertNotIn("tenants_tenant", tables)
+        with tenant_schema("alpha"):
+            self.assertFalse(Librarian.objects.exists())
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM django_migrations")
+                self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_indexes_keep_their_names(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = 'alpha' AND tablename = 'library_book'")
+            self.assertIn("book_search_vector", {index for index, in cursor.fetchall()})
+
+    def test_data_is_kept_per_schema(self):
+        with tenant_schema("alpha"):
+            librarian = Librarian.objects.create_user(email="alpha@gmail.com", password="password")
+            Book.objects.create(title="Truyện Kiều", author="Nguyễn Du", category="poetry", librarian=librarian)
+            self.assertEqual(Book.objects.filter(search_vector="kieu").count(), 1)
+
+        self.assertFalse(Book.objects.exists())
+        self.assertEqual(list(Librarian.objects.values_list("email", flat=True)), ["public@gmail.com"])
+
+    def test_schema_name_is_validated(self):
+        for schema_name in ["public", "pg_temp", "Alpha", "1alpha"]:
+            with self.assertRaises(ValidationError):
+                create_tenant("Other", f"{schema_name}.example.com", schema_name)
+
+    def test_tenants_are_looked_up_by_host(self):
+        self.assertEqual(get_tenant_for_host("alpha.example.com:8000"), self.tenant)
+        self.assertIsNone(get_tenant_for_host("testserver"))
+
+        # The cached lookup is dropped when a tenant changes.
+        Tenant.objects.filter(pk=self.tenant.pk).update(domain="beta.example.com")
+        self.assertEqual(get_tenant_for_host("alpha.example.com"), self.tenant)
+        self.tenant.domain = "beta.example.com"
+        self.tenant.save()
+        self.assertIsNone(get_tenant_for_host("alpha.example.com"))
+
+    def test_requests_are_routed_by_host(self):
+        with tenant_schema("alpha"):
+            librarian = Librarian.objects.create_user(email="alpha@gmail.com", password="password")
+            Book.objects.create(title="Alpha Book", author="Author", category="fiction", librarian=librarian)
+            self.client.force_login(librarian)
+
+        response = self.client.get(reverse("books"), HTTP_HOST="alpha.example.com")
+        self.assertEqual([book.title for book in response.context["books"]], ["Alpha Book"])
+        self.assertEqual(response.wsgi_request.tenant, self.tenant)
+
+        # The session only exists in the tenant's schema.
+        response = self.client.get(reverse("books"), HTTP_HOST="testserver")
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('books')}")
+
+    def test_accrue_fines_runs_in_every_schema(self):
+        out = StringIO()
+
+        call_command("accrue_fines", stdout=out)
+
+        self.assertIn("alpha: Updated the amount due of 0 members.", out.getvalue())
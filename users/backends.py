@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+CACHED_USER_KEY = "users:librarian:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the logged-in Librarian of each request from the cache instead of the database.
+    Cached users are dropped whenever a Librarian is saved or deleted, so profile and password changes, which also
+    change the session hash, are seen by the next request.
+    """
+
+    def get_user(self, user_id):
+        timeout = settings.USER_CACHE_TIMEOUT
+        if not timeout:
+            return super().get_user(user_id)
+
+        key = CACHED_USER_KEY.format(user_id=user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, timeout)
+        return user
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drop the cached user right away and again once the current transaction commits, so a request that loaded the
+    user before the commit can't cache the old row back.
+    """
+    key = CACHED_USER_KEY.format(user_id=user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:42
+
+import users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('library', '0007_strip_id_prefixes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='librarian',
+            name='id',
+            field=models.UUIDField(default=users.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
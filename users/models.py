@@ -1,23 +1,31 @@
+import os
+import time
 import uuid
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 
 
+def uuid7():
+    """
+    Return a time-ordered UUID (RFC 9562 version 7): a millisecond timestamp followed by random bits.
+    New rows are appended at the end of primary key indexes instead of landing at random pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms << 80) | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # variant
+    return uuid.UUID(int=value)
+
+
 class AbstractBaseModel(models.Model):
-    id = models.CharField(max_length=255, primary_key=True)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
 
-    def save(self, *args, **kwargs):
-        if not self.id:
-            table_name = self.__class__.__name__.lower()
-            self.id = f"{table_name}-{str(uuid.uuid4())}"
-        super().save(*args, **kwargs)
-
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password, **extra_fields):
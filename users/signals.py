@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.backends import invalidate_cached_user
+from users.models import Librarian
+
+
+@receiver([post_save, post_delete], sender=Librarian)
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
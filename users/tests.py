@@ -1,3 +1,47 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from users.models import Librarian, uuid7
+
+
+class TestUUID7(SimpleTestCase):
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, "specified in RFC 4122")
+
+    def test_time_ordered(self):
+        first = uuid7()
+        values = [uuid7() for _ in range(100)]
+
+        self.assertTrue(all(first.int >> 80 <= value.int >> 80 for value in values))
+
+
+class TestCachedUser(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+        self.client.get(reverse("home"))
+
+    def test_user_is_loaded_from_cache(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.context["user"], self.user)
+
+    def test_profile_change_invalidates_cached_user(self):
+        self.user.first_name = "Jane"
+        self.user.save()
+
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.context["user"].first_name, "Jane")
+
+    def test_password_change_logs_other_sessions_out(self):
+        self.user.set_password("new-password")
+        self.user.save()
+
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.status_code, 302)